@@ -2,23 +2,224 @@
 from __future__ import absolute_import, print_function, unicode_literals
 
 from _Framework.ControlSurface import ControlSurface
+import asyncio
+import collections
+import concurrent.futures
+import contextlib
+import functools
 import socket
 import json
 import threading
 import time
 import traceback
 import math
-
-# Change queue import for Python 2
-try:
-    import Queue as queue  # Python 2
-except ImportError:
-    import queue  # Python 3
+import operator
+import os
+import re
+import selectors
 
 # Constants for socket communication
 DEFAULT_PORT = 9877
 HOST = "localhost"
 
+# Worker threads for commands that don't need Live's main thread
+THREAD_POOL_SIZE = int(os.environ.get("ABLETONMCP_THREAD_POOL_SIZE", 32))
+
+# Maximum number of devices whose name -> parameter maps are kept
+DEVICE_PARAM_CACHE_SIZE = 64
+
+# Maximum number of quantized parameters whose value item lookups are kept
+VALUE_ITEM_CACHE_SIZE = 512
+
+# Maximum number of browser items remembered by URI
+BROWSER_URI_CACHE_SIZE = 20000
+
+# Browser items indexed per main-thread tick while warming the URI cache
+BROWSER_INDEX_SLICE = 200
+
+# Log full tracebacks for every handled error, not just unexpected ones
+DEBUG = os.environ.get("ABLETONMCP_DEBUG", "") not in ("", "0")
+
+# Kernel buffer size for client sockets and the size of each read
+SOCKET_BUFFER_SIZE = 262144
+RECV_SIZE = 65536
+
+# JSON codec entry points, bound once for the per-message hot path. Responses
+# are UTF-8 encoded anyway, so skip \uXXXX escaping and insignificant whitespace
+_JSON_KW = dict(ensure_ascii=False, separators=(",", ":"))
+_dumps = json.JSONEncoder(**_JSON_KW).encode
+_loads = json.loads
+
+# Pre-encoded head of an error response; only the message needs serializing
+_ERROR_RESPONSE_PREFIX = b'{"status":"error","message":'
+
+def _encode_error(message):
+    """Encode an error response for message without building a response dict"""
+    return _ERROR_RESPONSE_PREFIX + _dumps(message).encode('utf-8') + b'}'
+
+@functools.lru_cache(maxsize=256)
+def _split_browser_path(path):
+    """Split a browser path into (lowercase root category, non-empty folder names)"""
+    parts = path.split("/")
+    return parts[0].lower(), tuple(part for part in parts[1:] if part)
+
+# EQ Eight's frequency range on a log scale, for Hz -> normalized value conversion
+_LOG_FREQ_MIN = math.log10(20)  # 20 Hz
+_LOG_FREQ_MAX = math.log10(20000)  # 20 kHz
+_LOG_FREQ_SPAN = _LOG_FREQ_MAX - _LOG_FREQ_MIN
+
+# EQ Eight parameter names for each band (index 0-7 -> band number 1-8)
+_EQ_BAND_PARAM_NAMES = tuple({
+    "enable": f"{b + 1} Filter On A",
+    "freq": f"{b + 1} Frequency A",
+    "gain": f"{b + 1} Gain A",
+    "q": f"{b + 1} Resonance A",
+    "type": f"{b + 1} Filter Type A",
+} for b in range(8))
+
+# Keys for each band's entry in apply_eq_preset results
+_EQ_BAND_RESULT_KEYS = tuple(f"band_{b}" for b in range(8))
+
+# Device types identified by class name alone
+_DEVICE_CLASS_TYPES = {
+    "PluginDevice": "plugin",
+    "InstrumentGroupDevice": "instrument_rack",
+    "DrumGroupDevice": "drum_rack",
+}
+
+# EQ Eight presets: band index -> settings (treat as read-only)
+_EQ_PRESETS = {
+    "low_cut": {
+        0: {"enabled": True, "freq": 80, "gain": 0, "q": 0.7, "type": "High Pass 48dB"}
+    },
+    "high_cut": {
+        7: {"enabled": True, "freq": 10000, "gain": 0, "q": 0.7, "type": "Low Pass 48dB"}
+    },
+    "low_shelf": {
+        0: {"enabled": True, "freq": 100, "gain": -3, "q": 0.7, "type": "Low Shelf"}
+    },
+    "high_shelf": {
+        7: {"enabled": True, "freq": 8000, "gain": -3, "q": 0.7, "type": "High Shelf"}
+    },
+    "bell": {
+        3: {"enabled": True, "freq": 1000, "gain": 0, "q": 1.0, "type": "Bell"}
+    },
+    "notch": {
+        3: {"enabled": True, "freq": 1000, "gain": -12, "q": 8.0, "type": "Notch"}
+    },
+    "flat": {
+        # Reset all bands to default values
+        0: {"enabled": False},
+        1: {"enabled": False},
+        2: {"enabled": False},
+        3: {"enabled": False},
+        4: {"enabled": False},
+        5: {"enabled": False},
+        6: {"enabled": False},
+        7: {"enabled": False}
+    }
+}
+_EQ_PRESET_NAMES = ", ".join(_EQ_PRESETS)
+
+# Browser root categories that a get_browser_item path can start with
+_BROWSER_ROOTS = frozenset(("instruments", "sounds", "drums", "audio_effects", "midi_effects"))
+
+# Display names for the standard browser roots, in get_browser_tree order
+_BROWSER_ROOT_NAMES = (
+    ("instruments", "Instruments"),
+    ("sounds", "Sounds"),
+    ("drums", "Drums"),
+    ("audio_effects", "Audio Effects"),
+    ("midi_effects", "MIDI Effects"),
+)
+
+# Browser URI namespaces ("query:<namespace>#...") and the root category holding them
+_URI_NAMESPACE_ROOTS = {
+    "synths": "instruments",
+    "sounds": "sounds",
+    "drums": "drums",
+    "audiofx": "audio_effects",
+    "midifx": "midi_effects",
+}
+_URI_NAMESPACE = re.compile(r'^query:([^#:/]+)')
+
+# Linear mixer volume -> dB mapping (see _linear_to_db)
+_VOLUME_0DB = 0.85
+_INV_VOLUME_0DB = 1.0 / _VOLUME_0DB
+_VOLUME_DB_SLOPE_ABOVE_0DB = 6.0 / 0.15  # 0.85 to 1.0 maps to 0dB to +6dB
+_VOLUME_EPSILON = 1e-7
+_NEG_INF = float('-inf')
+
+# Batched Live property reads for the polled getters
+_SESSION_ATTRS = operator.attrgetter("tempo", "signature_numerator", "signature_denominator")
+_TRACK_ATTRS = operator.attrgetter(
+    "name", "has_audio_input", "has_midi_input", "mute", "solo",
+    "mixer_device.volume.value", "mixer_device.panning.value")
+_CLIP_ATTRS = operator.attrgetter("name", "length", "is_playing", "is_recording", "color")
+
+# Characters that matter when looking for the end of a JSON message
+_JSON_FRAME_TOKENS = re.compile(br'["\\{}\[\]]')
+
+class JSONStreamFramer(object):
+    """Split a byte stream of back-to-back JSON messages into complete messages
+    
+    Only newly received bytes are scanned (tracking bracket depth and string
+    state), so a large message arriving in many chunks is parsed exactly once
+    instead of being re-parsed from the start after every chunk.
+    """
+    
+    def __init__(self):
+        self._buffer = bytearray()
+        self._scan_pos = 0
+        self._depth = 0
+        self._in_string = False
+    
+    def feed(self, data):
+        """Add received bytes and return a list of complete messages
+        
+        Messages are returned as bytearrays, which json.loads accepts directly.
+        """
+        buffer = self._buffer
+        buffer.extend(data)
+        
+        messages = []
+        start = 0
+        resume = self._scan_pos
+        depth = self._depth
+        in_string = self._in_string
+        
+        for match in _JSON_FRAME_TOKENS.finditer(buffer, self._scan_pos):
+            pos = match.start()
+            if pos < resume:
+                # This character was escaped by a preceding backslash
+                continue
+            char = buffer[pos]
+            if in_string:
+                if char == 0x5C:  # backslash, skip the escaped character
+                    resume = pos + 2
+                elif char == 0x22:  # closing quote
+                    in_string = False
+            elif char == 0x22:  # opening quote
+                in_string = True
+            elif char == 0x7B or char == 0x5B:  # { or [
+                depth += 1
+            else:  # } or ]
+                depth -= 1
+                if depth == 0:
+                    messages.append(buffer[start:pos + 1])
+                    start = pos + 1
+                elif depth < 0:
+                    # Unbalanced input, drop it so the stream can recover
+                    depth = 0
+                    start = pos + 1
+        
+        # Discard consumed bytes and remember where to continue scanning
+        self._scan_pos = max(resume, len(buffer)) - start
+        del buffer[:start]
+        self._depth = depth
+        self._in_string = in_string
+        return messages
+
 def create_instance(c_instance):
     """Create and return the AbletonMCP script instance"""
     return AbletonMCP(c_instance)
@@ -26,23 +227,133 @@ def create_instance(c_instance):
 class AbletonMCP(ControlSurface):
     """AbletonMCP Remote Script for Ableton Live"""
     
+    # Command routing tables: command type -> handler(self, params).
+    # Handlers for commands that only read or tweak state run on the worker pool.
+    _DIRECT_HANDLERS = {
+        "get_session_info": lambda s, p: s._get_session_info(),
+        "get_track_info": lambda s, p: s._get_track_info(p.get("track_index", 0)),
+        "get_device_parameters": lambda s, p: s._get_device_parameters(
+            p.get("track_index", 0), p.get("device_index", 0)),
+        "set_device_parameter": lambda s, p: s._set_device_parameter(
+            p.get("track_index", 0), p.get("device_index", 0),
+            p.get("parameter_name", None), p.get("parameter_index", None), p.get("value", None)),
+        "set_eq_global": lambda s, p: s._set_eq_global(
+            p.get("track_index", 0), p.get("device_index", 0),
+            p.get("scale", None), p.get("mode", None), p.get("oversampling", None)),
+    }
+    
+    # Commands that modify Live's state and must run on the main thread. This
+    # includes every writer that groups its changes into one undo step: undo
+    # steps must be opened on the main thread, and running them there keeps
+    # two clients' steps from interleaving. The browser readers run here too:
+    # the browser API isn't thread-safe, and they share the browser caches
+    # with the main-thread warm walk
+    _MAIN_THREAD_HANDLERS = {
+        "get_browser_item": lambda s, p: s._get_browser_item(p.get("uri", None), p.get("path", None)),
+        "get_browser_categories": lambda s, p: s._get_browser_categories(p.get("category_type", "all")),
+        "get_browser_items": lambda s, p: s._get_browser_items(p.get("path", ""), p.get("item_type", "all")),
+        "get_browser_tree": lambda s, p: s.get_browser_tree(p.get("category_type", "all")),
+        "get_browser_items_at_path": lambda s, p: s.get_browser_items_at_path(p.get("path", "")),
+        "create_midi_track": lambda s, p: s._create_midi_track(p.get("index", -1)),
+        "set_track_name": lambda s, p: s._set_track_name(p.get("track_index", 0), p.get("name", "")),
+        "create_clip": lambda s, p: s._create_clip(
+            p.get("track_index", 0), p.get("clip_index", 0), p.get("length", 4.0)),
+        "add_notes_to_clip": lambda s, p: s._add_notes_to_clip(
+            p.get("track_index", 0), p.get("clip_index", 0), p.get("notes", [])),
+        "set_clip_name": lambda s, p: s._set_clip_name(
+            p.get("track_index", 0), p.get("clip_index", 0), p.get("name", "")),
+        "set_tempo": lambda s, p: s._set_tempo(p.get("tempo", 120.0)),
+        "fire_clip": lambda s, p: s._fire_clip(p.get("track_index", 0), p.get("clip_index", 0)),
+        "stop_clip": lambda s, p: s._stop_clip(p.get("track_index", 0), p.get("clip_index", 0)),
+        "start_playback": lambda s, p: s._start_playback(),
+        "stop_playback": lambda s, p: s._stop_playback(),
+        "load_browser_item": lambda s, p: s._load_browser_item(
+            p.get("track_index", 0), p.get("item_uri", "")),
+        "create_return_track": lambda s, p: s._create_return_track(),
+        "set_send_level": lambda s, p: s._set_send_level(
+            p.get("track_index", 0), p.get("send_index", 0), p.get("value", 0.0)),
+        "set_track_volume": lambda s, p: s._set_track_volume(
+            p.get("track_index", 0), p.get("value", 0.0)),
+        "apply_batch": lambda s, p: s._apply_batch(p.get("commands", [])),
+        "set_device_parameters_batch": lambda s, p: s._set_device_parameters_batch(
+            p.get("track_index", 0), p.get("device_index", 0), p.get("updates", [])),
+        "set_eq_band": lambda s, p: s._set_eq_band(
+            p.get("track_index", 0), p.get("device_index", 0), p.get("band_index", 0),
+            p.get("frequency", None), p.get("gain", None), p.get("q", None), p.get("filter_type", None)),
+        "apply_eq_preset": lambda s, p: s._apply_eq_preset(
+            p.get("track_index", 0), p.get("device_index", 0), p.get("preset_type", "")),
+    }
+    
+    # Updates that apply_batch can run in one main-thread pass
+    _BATCH_HANDLERS = {
+        "set_track_volume": _MAIN_THREAD_HANDLERS["set_track_volume"],
+        "set_send_level": _MAIN_THREAD_HANDLERS["set_send_level"],
+        "set_device_parameter": _DIRECT_HANDLERS["set_device_parameter"],
+        "set_eq_band": _MAIN_THREAD_HANDLERS["set_eq_band"],
+    }
+    
     def __init__(self, c_instance):
         """Initialize the control surface"""
         ControlSurface.__init__(self, c_instance)
         self.log_message("AbletonMCP Remote Script initializing...")
         
-        # Socket server for communication
+        # Socket server for communication, driven by an asyncio event loop
+        # running on a dedicated thread (one task per client, not one thread)
         self.server = None
-        self.client_threads = []
         self.server_thread = None
         self.running = False
+        self._debug = DEBUG
+        self._loop = None
+        self._accept_task = None
+        self._had_client = False
+        self._client_tasks = set()
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=THREAD_POOL_SIZE)
+        
+        # Main-thread work queued between ticks, run by a single scheduled drain
+        self._pending = collections.deque()
+        self._pending_lock = threading.Lock()
+        self._scheduled = False
         
         # Cache the song reference for easier access
         self._song = self.song()
         
+        # The master mixer never changes; the track lists are refreshed by listeners
+        self._master_mixer = self._song.master_track.mixer_device
+        self._refresh_track_cache()
+        
+        # Live's browser, fetched from the application on first use
+        self._browser = None
+        
+        # Browser items seen by URI lookups, so repeat lookups skip the tree walk
+        self._uri_to_item = {}
+        # The startup walk that warms _uri_to_item, advanced a slice at a time
+        self._browser_index_walk = None
+        self._browser_index_start = 0.0
+        # Lowercase child name -> child maps per browser folder, keyed by folder URI
+        self._browser_children = {}
+        # Public browser attribute names per browser type, so dir() runs once
+        self._browser_attrs_cache = {}
+        
+        # Undo steps currently open, so nested writers join the outer step
+        self._undo_depth = 0
+        
+        # Name -> parameter maps per device, keyed by Live's object pointer
+        self._device_param_cache = {}
+        
+        # Value item names and lowercase name -> index maps per quantized parameter
+        self._value_item_cache = {}
+        self._song.add_tracks_listener(self._refresh_track_cache)
+        self._song.add_return_tracks_listener(self._refresh_track_cache)
+        
         # Start the socket server
         self.start_server()
         
+        # Warm the browser URI cache so the first lookup doesn't walk the tree. The
+        # browser API isn't thread-safe, so the walk runs on the main thread in
+        # small slices rather than all at once on the worker pool
+        if self.running:
+            self.schedule_message(1, self._index_browser_slice)
+        
         self.log_message("AbletonMCP initialized")
         
         # Show a message in Ableton
@@ -53,35 +364,54 @@ class AbletonMCP(ControlSurface):
         self.log_message("AbletonMCP disconnecting...")
         self.running = False
         
-        # Stop the server
-        if self.server:
+        # Stop the server; this closes the listening socket and cancels client handlers
+        if self._loop:
             try:
-                self.server.close()
-            except:
+                self._loop.call_soon_threadsafe(self._stop_server)
+            except RuntimeError:
+                # The event loop is already closed
                 pass
         
         # Wait for the server thread to exit
         if self.server_thread and self.server_thread.is_alive():
             self.server_thread.join(1.0)
-            
-        # Clean up any client threads
-        for client_thread in self.client_threads[:]:
-            if client_thread.is_alive():
-                # We don't join them as they might be stuck
-                self.log_message("Client thread still alive during disconnect")
+        
+        # Don't block Live's shutdown on commands still running in the pool
+        self._pool.shutdown(wait=False)
+        
+        if self._song.tracks_has_listener(self._refresh_track_cache):
+            self._song.remove_tracks_listener(self._refresh_track_cache)
+        if self._song.return_tracks_has_listener(self._refresh_track_cache):
+            self._song.remove_return_tracks_listener(self._refresh_track_cache)
+        self._browser = None
+        self._browser_index_walk = None
+        self._uri_to_item.clear()
+        self._browser_children.clear()
+        self._browser_attrs_cache.clear()
         
         ControlSurface.disconnect(self)
         self.log_message("AbletonMCP disconnected")
     
+    def _refresh_track_cache(self):
+        """Re-read the song's track lists (listener for track additions and removals)"""
+        self._tracks = self._song.tracks
+        self._return_tracks = self._song.return_tracks
+    
     def start_server(self):
         """Start the socket server in a separate thread"""
         try:
+            # One selector (epoll/kqueue) waits on the listener, every client and the
+            # loop's own wakeup pipe, so shutdown never waits on a poll timeout
+            self._loop = asyncio.SelectorEventLoop(selectors.DefaultSelector())
+            # Bind here rather than on the server thread so errors are reported immediately
             self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.server.bind((HOST, DEFAULT_PORT))
             self.server.listen(5)  # Allow up to 5 pending connections
+            self.server.setblocking(False)
             
             self.running = True
+            self._accept_task = self._loop.create_task(self._accept_clients())
             self.server_thread = threading.Thread(target=self._server_thread)
             self.server_thread.daemon = True
             self.server_thread.start()
@@ -90,292 +420,255 @@ class AbletonMCP(ControlSurface):
         except Exception as e:
             self.log_message("Error starting server: " + str(e))
             self.show_message("AbletonMCP: Error starting server - " + str(e))
+            if self.server:
+                self.server.close()
+                self.server = None
+            if self._loop:
+                self._loop.close()
+                self._loop = None
     
     def _server_thread(self):
-        """Server thread implementation - handles client connections"""
+        """Server thread implementation - runs the event loop serving all clients"""
+        loop = self._loop
         try:
             self.log_message("Server thread started")
-            # Set a timeout to allow regular checking of running flag
-            self.server.settimeout(1.0)
+            asyncio.set_event_loop(loop)
+            loop.run_forever()
             
-            while self.running:
-                try:
-                    # Accept connections with timeout
-                    client, address = self.server.accept()
-                    self.log_message("Connection accepted from " + str(address))
-                    self.show_message("AbletonMCP: Client connected")
-                    
-                    # Handle client in a separate thread
-                    client_thread = threading.Thread(
-                        target=self._handle_client,
-                        args=(client,)
-                    )
-                    client_thread.daemon = True
-                    client_thread.start()
-                    
-                    # Keep track of client threads
-                    self.client_threads.append(client_thread)
-                    
-                    # Clean up finished client threads
-                    self.client_threads = [t for t in self.client_threads if t.is_alive()]
-                    
-                except socket.timeout:
-                    # No connection yet, just continue
-                    continue
-                except Exception as e:
-                    if self.running:  # Only log if still running
-                        self.log_message("Server accept error: " + str(e))
-                    time.sleep(0.5)
+            # Let cancelled client handlers finish before closing the loop
+            pending = asyncio.all_tasks(loop)
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
             
             self.log_message("Server thread stopped")
         except Exception as e:
             self.log_message("Server thread error: " + str(e))
+        finally:
+            loop.close()
     
-    def _handle_client(self, client):
+    def _stop_server(self):
+        """Close the server and cancel client handlers (runs on the event loop)"""
+        if self._accept_task:
+            self._accept_task.cancel()
+        if self.server:
+            self.server.close()
+        for task in list(self._client_tasks):
+            task.cancel()
+        self._loop.stop()
+    
+    def _tune_client_socket(self, sock):
+        """Disable Nagle and raise the kernel buffers on a client socket"""
+        if sock is None:
+            return
+        try:
+            # Every message is a discrete request/response, so never hold one back
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            for option in (socket.SO_SNDBUF, socket.SO_RCVBUF):
+                # Only ever raise the buffers, never shrink a larger system default
+                if sock.getsockopt(socket.SOL_SOCKET, option) < SOCKET_BUFFER_SIZE:
+                    sock.setsockopt(socket.SOL_SOCKET, option, SOCKET_BUFFER_SIZE)
+        except (OSError, AttributeError) as e:
+            self.log_message("Could not tune client socket: " + str(e))
+    
+    async def _accept_clients(self):
+        """Accept connections and start a handler task for each (runs on the event loop)"""
+        loop = self._loop
+        while self.running:
+            try:
+                client, address = await loop.sock_accept(self.server)
+            except asyncio.CancelledError:
+                raise
+            except OSError as e:
+                if not self.running:
+                    break
+                self.log_message("Error accepting connection: " + str(e))
+                continue
+            
+            if self._debug:
+                self.log_message("Connection accepted from " + str(address))
+            # Only toast the first connection; scripted clients may reconnect constantly
+            if not self._had_client:
+                self._had_client = True
+                self.show_message("AbletonMCP: Client connected")
+            client.setblocking(False)
+            self._tune_client_socket(client)
+            task = loop.create_task(self._handle_client_async(client))
+            self._client_tasks.add(task)
+    
+    async def _handle_client_async(self, client):
         """Handle communication with a connected client"""
+        loop = self._loop
+        task = asyncio.current_task()
         self.log_message("Client handler started")
-        client.settimeout(None)  # No timeout for client socket
-        buffer = ''  # Changed from b'' to '' for Python 2
+        framer = JSONStreamFramer()
+        
+        # Reused for every read, so receiving allocates nothing per chunk
+        buf = bytearray(RECV_SIZE)
+        view = memoryview(buf)
         
         try:
             while self.running:
-                try:
-                    # Receive data
-                    data = client.recv(8192)
-                    
-                    if not data:
-                        # Client disconnected
-                        self.log_message("Client disconnected")
-                        break
-                    
-                    # Accumulate data in buffer with explicit encoding/decoding
-                    try:
-                        # Python 3: data is bytes, decode to string
-                        buffer += data.decode('utf-8')
-                    except AttributeError:
-                        # Python 2: data is already string
-                        buffer += data
-                    
+                # Receive data; a socket error ends the connection
+                n = await loop.sock_recv_into(client, buf)
+                
+                if not n:
+                    # Client disconnected
+                    self.log_message("Client disconnected")
+                    break
+                
+                # Handle every command completed by this chunk; an
+                # incomplete command stays buffered until more data arrives
+                for message in framer.feed(view[:n]):
+                    # Every framed command gets exactly one reply, so a bad
+                    # one doesn't swallow the commands pipelined after it
                     try:
-                        # Try to parse command from buffer
-                        command = json.loads(buffer)  # Removed decode('utf-8')
-                        buffer = ''  # Clear buffer after successful parse
+                        command = _loads(message)
                         
                         self.log_message("Received command: " + str(command.get("type", "unknown")))
                         
                         # Process the command and get response
-                        response = self._process_command(command)
-                        
-                        # Send the response with explicit encoding
-                        try:
-                            # Python 3: encode string to bytes
-                            client.sendall(json.dumps(response).encode('utf-8'))
-                        except AttributeError:
-                            # Python 2: string is already bytes
-                            client.sendall(json.dumps(response))
-                    except ValueError:
-                        # Incomplete data, wait for more
-                        continue
-                        
-                except Exception as e:
-                    self.log_message("Error handling client data: " + str(e))
-                    self.log_message(traceback.format_exc())
-                    
-                    # Send error response if possible
-                    error_response = {
-                        "status": "error",
-                        "message": str(e)
-                    }
-                    try:
-                        # Python 3: encode string to bytes
-                        client.sendall(json.dumps(error_response).encode('utf-8'))
-                    except AttributeError:
-                        # Python 2: string is already bytes
-                        client.sendall(json.dumps(error_response))
-                    except:
-                        # If we can't send the error, the connection is probably dead
-                        break
+                        data = _dumps(await self._process_command(command)).encode('utf-8')
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        self.log_message("Error handling client data: " + str(e))
+                        # Bad input is routine; only trace the rest
+                        if self._debug or not isinstance(e, ValueError):
+                            self.log_message(traceback.format_exc())
+                        data = _encode_error(str(e))
                     
-                    # For serious errors, break the loop
-                    if not isinstance(e, ValueError):
-                        break
+                    # Send the response
+                    await loop.sock_sendall(client, data)
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
             self.log_message("Error in client handler: " + str(e))
         finally:
+            self._client_tasks.discard(task)
             try:
                 client.close()
-            except:
+            except Exception:
                 pass
             self.log_message("Client handler stopped")
     
-    def _process_command(self, command):
+    async def _process_command(self, command):
         """Process a command from the client and return a response"""
         command_type = command.get("type", "")
         params = command.get("params", {})
         
+        # Commands that modify Live's state should be scheduled on the main thread
+        handler = self._MAIN_THREAD_HANDLERS.get(command_type)
+        if handler is not None:
+            return await self._run_on_main(handler, params)
+        
+        handler = self._DIRECT_HANDLERS.get(command_type)
+        if handler is None:
+            return {
+                "status": "error",
+                "result": {},
+                "message": "Unknown command: " + command_type
+            }
+        
+        # Everything else runs on the bounded worker pool so a slow query
+        # (e.g. a large device parameter dump) doesn't stall the other clients
+        return await self._loop.run_in_executor(self._pool, self._run_direct, handler, params)
+    
+    async def _run_on_main(self, handler, params):
+        """Run a command handler on Live's main thread and wait for the result"""
         # Initialize response
         response = {
             "status": "success",
             "result": {}
         }
         
+        # The handler's return value (or exception) comes back through the future
+        future = concurrent.futures.Future()
+        
         try:
-            # Route the command to the appropriate handler
-            if command_type == "get_session_info":
-                response["result"] = self._get_session_info()
-            elif command_type == "get_track_info":
-                track_index = params.get("track_index", 0)
-                response["result"] = self._get_track_info(track_index)
-            # Commands that modify Live's state should be scheduled on the main thread
-            elif command_type in ["create_midi_track", "set_track_name", 
-                                 "create_clip", "add_notes_to_clip", "set_clip_name", 
-                                 "set_tempo", "fire_clip", "stop_clip",
-                                 "start_playback", "stop_playback", "load_browser_item", "create_return_track", "set_send_level", "set_track_volume"]:
-                # Use a thread-safe approach with a response queue
-                response_queue = queue.Queue()
-                
-                # Define a function to execute on the main thread
-                def main_thread_task():
-                    try:
-                        result = None
-                        if command_type == "create_midi_track":
-                            index = params.get("index", -1)
-                            result = self._create_midi_track(index)
-                        elif command_type == "set_track_name":
-                            track_index = params.get("track_index", 0)
-                            name = params.get("name", "")
-                            result = self._set_track_name(track_index, name)
-                        elif command_type == "create_clip":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            length = params.get("length", 4.0)
-                            result = self._create_clip(track_index, clip_index, length)
-                        elif command_type == "add_notes_to_clip":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            notes = params.get("notes", [])
-                            result = self._add_notes_to_clip(track_index, clip_index, notes)
-                        elif command_type == "set_clip_name":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            name = params.get("name", "")
-                            result = self._set_clip_name(track_index, clip_index, name)
-                        elif command_type == "set_tempo":
-                            tempo = params.get("tempo", 120.0)
-                            result = self._set_tempo(tempo)
-                        elif command_type == "fire_clip":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            result = self._fire_clip(track_index, clip_index)
-                        elif command_type == "stop_clip":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            result = self._stop_clip(track_index, clip_index)
-                        elif command_type == "start_playback":
-                            result = self._start_playback()
-                        elif command_type == "stop_playback":
-                            result = self._stop_playback()
-                        elif command_type == "load_browser_item":
-                            track_index = params.get("track_index", 0)
-                            item_uri = params.get("item_uri", "")
-                            result = self._load_browser_item(track_index, item_uri)
-                        elif command_type == "create_return_track":
-                            result = self._create_return_track()
-                        elif command_type == "set_send_level":
-                            track_index = params.get("track_index", 0)
-                            send_index = params.get("send_index", 0)
-                            value = params.get("value", 0.0)
-                            result = self._set_send_level(track_index, send_index, value)
-                        elif command_type == "set_track_volume":
-                            track_index = params.get("track_index", 0)
-                            value = params.get("value", 0.0)
-                            result = self._set_track_volume(track_index, value)
-                        
-                        # Put the result in the queue
-                        response_queue.put({"status": "success", "result": result})
-                    except Exception as e:
-                        self.log_message("Error in main thread task: " + str(e))
-                        self.log_message(traceback.format_exc())
-                        response_queue.put({"status": "error", "message": str(e)})
-                
-                # Schedule the task to run on the main thread
-                try:
-                    self.schedule_message(0, main_thread_task)
-                except AssertionError:
-                    # If we're already on the main thread, execute directly
-                    main_thread_task()
-                
-                # Wait for the response with a timeout
-                try:
-                    task_response = response_queue.get(timeout=10.0)
-                    if task_response.get("status") == "error":
-                        response["status"] = "error"
-                        response["message"] = task_response.get("message", "Unknown error")
-                    else:
-                        response["result"] = task_response.get("result", {})
-                except queue.Empty:
-                    response["status"] = "error"
-                    response["message"] = "Timeout waiting for operation to complete"
-            elif command_type == "get_browser_item":
-                uri = params.get("uri", None)
-                path = params.get("path", None)
-                response["result"] = self._get_browser_item(uri, path)
-            elif command_type == "get_browser_categories":
-                category_type = params.get("category_type", "all")
-                response["result"] = self._get_browser_categories(category_type)
-            elif command_type == "get_browser_items":
-                path = params.get("path", "")
-                item_type = params.get("item_type", "all")
-                response["result"] = self._get_browser_items(path, item_type)
-            # Add the new browser commands
-            elif command_type == "get_browser_tree":
-                category_type = params.get("category_type", "all")
-                response["result"] = self.get_browser_tree(category_type)
-            elif command_type == "get_browser_items_at_path":
-                path = params.get("path", "")
-                response["result"] = self.get_browser_items_at_path(path)
-            elif command_type == "get_device_parameters":
-                track_index = params.get("track_index", 0)
-                device_index = params.get("device_index", 0)
-                response["result"] = self._get_device_parameters(track_index, device_index)
-            elif command_type == "set_device_parameter":
-                track_index = params.get("track_index", 0)
-                device_index = params.get("device_index", 0)
-                parameter_name = params.get("parameter_name", None)
-                parameter_index = params.get("parameter_index", None)
-                value = params.get("value", None)
-                response["result"] = self._set_device_parameter(track_index, device_index, parameter_name, parameter_index, value)
-            elif command_type == "set_eq_band":
-                track_index = params.get("track_index", 0)
-                device_index = params.get("device_index", 0)
-                band_index = params.get("band_index", 0)
-                frequency = params.get("frequency", None)
-                gain = params.get("gain", None)
-                q = params.get("q", None)
-                filter_type = params.get("filter_type", None)
-                response["result"] = self._set_eq_band(track_index, device_index, band_index, frequency, gain, q, filter_type)
-            elif command_type == "set_eq_global":
-                track_index = params.get("track_index", 0)
-                device_index = params.get("device_index", 0)
-                scale = params.get("scale", None)
-                mode = params.get("mode", None)
-                oversampling = params.get("oversampling", None)
-                response["result"] = self._set_eq_global(track_index, device_index, scale, mode, oversampling)
-            elif command_type == "apply_eq_preset":
-                track_index = params.get("track_index", 0)
-                device_index = params.get("device_index", 0)
-                preset_type = params.get("preset_type", "")
-                response["result"] = self._apply_eq_preset(track_index, device_index, preset_type)
-            elif command_type == "set_track_volume":
-                track_index = params.get("track_index", 0)
-                value = params.get("value", 0.0)
-                response["result"] = self._set_track_volume(track_index, value)
-            else:
-                response["status"] = "error"
-                response["message"] = "Unknown command: " + command_type
+            # Queue the task; only the first one queued since the last drain schedules it
+            with self._pending_lock:
+                self._pending.append((future, handler, params))
+                first = not self._scheduled
+                self._scheduled = True
+            if first:
+                self._schedule_drain()
+        except Exception as e:
+            self.log_message("Error processing command: " + str(e))
+            if self._debug:
+                self.log_message(traceback.format_exc())
+            response["status"] = "error"
+            response["message"] = str(e)
+            return response
+        
+        # Wait for the result with a timeout, without blocking other clients
+        try:
+            response["result"] = await asyncio.wait_for(asyncio.wrap_future(future), 10.0)
+        except asyncio.TimeoutError:
+            response["status"] = "error"
+            response["message"] = "Timeout waiting for operation to complete"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Raised by the handler, already logged on the main thread
+            response["status"] = "error"
+            response["message"] = str(e)
+        
+        return response
+    
+    def _schedule_drain(self):
+        """Schedule _drain_pending on Live's main thread"""
+        try:
+            self.schedule_message(0, self._drain_pending)
+        except AssertionError:
+            # If we're already on the main thread, execute directly
+            self._drain_pending()
+        except Exception as e:
+            # Nothing will drain the queue, so fail everything waiting in it
+            with self._pending_lock:
+                batch = list(self._pending)
+                self._pending.clear()
+                self._scheduled = False
+            for future, handler, params in batch:
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(e)
+            raise
+    
+    def _drain_pending(self):
+        """Run every main-thread task queued since the last drain (runs on Live's main thread)"""
+        with self._pending_lock:
+            batch = list(self._pending)
+            self._pending.clear()
+            self._scheduled = False
+        for future, handler, params in batch:
+            self._main_thread_task(future, handler, params)
+    
+    def _main_thread_task(self, future, handler, params):
+        """Execute a command handler on Live's main thread and complete its future"""
+        # Skip the work if the caller already gave up waiting
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(handler(self, params))
+        except Exception as e:
+            self.log_message("Error in main thread task: " + str(e))
+            if self._debug:
+                self.log_message(traceback.format_exc())
+            future.set_exception(e)
+    
+    def _run_direct(self, handler, params):
+        """Run a command handler that doesn't need Live's main thread (runs on the worker pool)"""
+        # Initialize response
+        response = {
+            "status": "success",
+            "result": {}
+        }
+        
+        try:
+            response["result"] = handler(self, params)
         except Exception as e:
             self.log_message("Error processing command: " + str(e))
-            self.log_message(traceback.format_exc())
+            if self._debug:
+                self.log_message(traceback.format_exc())
             response["status"] = "error"
             response["message"] = str(e)
         
@@ -386,16 +679,18 @@ class AbletonMCP(ControlSurface):
     def _get_session_info(self):
         """Get information about the current session"""
         try:
+            tempo, numerator, denominator = _SESSION_ATTRS(self._song)
+            master_mixer = self._master_mixer
             result = {
-                "tempo": self._song.tempo,
-                "signature_numerator": self._song.signature_numerator,
-                "signature_denominator": self._song.signature_denominator,
-                "track_count": len(self._song.tracks),
-                "return_track_count": len(self._song.return_tracks),
+                "tempo": tempo,
+                "signature_numerator": numerator,
+                "signature_denominator": denominator,
+                "track_count": len(self._tracks),
+                "return_track_count": len(self._return_tracks),
                 "master_track": {
                     "name": "Master",
-                    "volume": self._song.master_track.mixer_device.volume.value,
-                    "panning": self._song.master_track.mixer_device.panning.value
+                    "volume": master_mixer.volume.value,
+                    "panning": master_mixer.panning.value
                 }
             }
             return result
@@ -408,49 +703,51 @@ class AbletonMCP(ControlSurface):
         try:
             track = self._get_track_by_index(track_index)
             
-            # Get clip slots
+            # Get clip slots, reading each Live property only once per slot
             clip_slots = []
+            append = clip_slots.append
             for slot_index, slot in enumerate(track.clip_slots):
+                has_clip = slot.has_clip
                 clip_info = None
-                if slot.has_clip:
-                    clip = slot.clip
+                if has_clip:
+                    name, length, is_playing, is_recording, color = _CLIP_ATTRS(slot.clip)
                     clip_info = {
-                        "name": clip.name,
-                        "length": clip.length,
-                        "is_playing": clip.is_playing,
-                        "is_recording": clip.is_recording,
-                        "color": clip.color
+                        "name": name,
+                        "length": length,
+                        "is_playing": is_playing,
+                        "is_recording": is_recording,
+                        "color": color
                     }
                 
-                clip_slots.append({
+                append({
                     "index": slot_index,
-                    "has_clip": slot.has_clip,
+                    "has_clip": has_clip,
                     "clip": clip_info
                 })
             
             # Get devices
-            devices = []
-            for device_index, device in enumerate(track.devices):
-                devices.append({
-                    "index": device_index,
-                    "name": device.name,
-                    "class_name": device.class_name,
-                    "type": self._get_device_type(device)
-                })
+            get_device_type = self._get_device_type
+            devices = [{
+                "index": device_index,
+                "name": device.name,
+                "class_name": device.class_name,
+                "type": get_device_type(device)
+            } for device_index, device in enumerate(track.devices)]
             
             # Determine if this is a return track
-            is_return_track = track_index >= len(self._song.tracks)
+            is_return_track = track_index >= len(self._tracks)
             
             # Create base track info
+            name, is_audio, is_midi, mute, solo, volume, panning = _TRACK_ATTRS(track)
             track_info = {
                 "index": track_index,
-                "name": track.name,
-                "is_audio_track": track.has_audio_input,
-                "is_midi_track": track.has_midi_input,
-                "mute": track.mute,
-                "solo": track.solo,
-                "volume": track.mixer_device.volume.value,
-                "panning": track.mixer_device.panning.value,
+                "name": name,
+                "is_audio_track": is_audio,
+                "is_midi_track": is_midi,
+                "mute": mute,
+                "solo": solo,
+                "volume": volume,
+                "panning": panning,
                 "clip_slots": clip_slots,
                 "devices": devices,
                 "is_return_track": is_return_track
@@ -463,7 +760,8 @@ class AbletonMCP(ControlSurface):
             return track_info
         except Exception as e:
             self.log_message("Error getting track info: " + str(e))
-            self.log_message(traceback.format_exc())
+            if self._debug:
+                self.log_message(traceback.format_exc())
             raise
     
     def _get_track_by_index(self, track_index):
@@ -471,27 +769,40 @@ class AbletonMCP(ControlSurface):
         if track_index < 0:
             raise IndexError("Track index out of range")
         
+        tracks = self._tracks
+        tracks_len = len(tracks)
+        
         # Check if this is a regular track
-        if track_index < len(self._song.tracks):
-            return self._song.tracks[track_index]
+        if track_index < tracks_len:
+            return tracks[track_index]
         
         # Check if this is a return track
-        return_track_index = track_index - len(self._song.tracks)
-        if return_track_index < len(self._song.return_tracks):
-            return self._song.return_tracks[return_track_index]
+        return_track_index = track_index - tracks_len
+        return_tracks = self._return_tracks
+        if return_track_index < len(return_tracks):
+            return return_tracks[return_track_index]
         
         # If we get here, the index is out of range
         raise IndexError("Track index out of range")
     
+    def _get_device_by_index(self, track, device_index):
+        """Get a device on a track by its index"""
+        devices = track.devices
+        if device_index < 0 or device_index >= len(devices):
+            raise IndexError("Device index out of range")
+        return devices[device_index]
+    
     def _create_midi_track(self, index):
         """Create a new MIDI track at the specified index"""
         try:
             # Create the track
             self._song.create_midi_track(index)
+            # Don't wait for the listener before the next command looks tracks up
+            self._refresh_track_cache()
             
             # Get the new track
-            new_track_index = len(self._song.tracks) - 1 if index == -1 else index
-            new_track = self._song.tracks[new_track_index]
+            new_track_index = len(self._tracks) - 1 if index == -1 else index
+            new_track = self._tracks[new_track_index]
             
             result = {
                 "index": new_track_index,
@@ -507,10 +818,12 @@ class AbletonMCP(ControlSurface):
         try:
             # Create the return track
             self._song.create_return_track()
+            # Don't wait for the listener before the next command looks tracks up
+            self._refresh_track_cache()
             
             # Get the new return track
-            new_return_track_index = len(self._song.return_tracks) - 1
-            new_return_track = self._song.return_tracks[new_return_track_index]
+            new_return_track_index = len(self._return_tracks) - 1
+            new_return_track = self._return_tracks[new_return_track_index]
             
             result = {
                 "index": new_return_track_index,
@@ -581,19 +894,15 @@ class AbletonMCP(ControlSurface):
             
             clip = clip_slot.clip
             
-            # Convert note data to Live's format
-            live_notes = []
-            for note in notes:
-                pitch = note.get("pitch", 60)
-                start_time = note.get("start_time", 0.0)
-                duration = note.get("duration", 0.25)
-                velocity = note.get("velocity", 100)
-                mute = note.get("mute", False)
-                
-                live_notes.append((pitch, start_time, duration, velocity, mute))
+            # Convert note data to Live's format in a single pass
+            live_notes = tuple(
+                (note.get("pitch", 60), note.get("start_time", 0.0), note.get("duration", 0.25),
+                 note.get("velocity", 100), note.get("mute", False))
+                for note in notes
+            )
             
             # Add the notes
-            clip.set_notes(tuple(live_notes))
+            clip.set_notes(live_notes)
             
             result = {
                 "note_count": len(notes)
@@ -717,9 +1026,7 @@ class AbletonMCP(ControlSurface):
         """Get a browser item by URI or path"""
         try:
             # Access the application's browser instance instead of creating a new one
-            app = self.application()
-            if not app:
-                raise RuntimeError("Could not access Live application")
+            browser = self._get_browser()
                 
             result = {
                 "uri": uri,
@@ -729,7 +1036,7 @@ class AbletonMCP(ControlSurface):
             
             # Try to find by URI first if provided
             if uri:
-                item = self._find_browser_item_by_uri(app.browser, uri)
+                item = self._find_browser_item_by_uri(browser, uri)
                 if item:
                     result["found"] = True
                     result["item"] = {
@@ -744,42 +1051,24 @@ class AbletonMCP(ControlSurface):
             # If URI not provided or not found, try by path
             if path:
                 # Parse the path and navigate to the specified item
-                path_parts = path.split("/")
+                root_name, folder_parts = _split_browser_path(path)
                 
                 # Determine the root based on the first part
-                current_item = None
-                if path_parts[0].lower() == "nstruments":
-                    current_item = app.browser.instruments
-                elif path_parts[0].lower() == "sounds":
-                    current_item = app.browser.sounds
-                elif path_parts[0].lower() == "drums":
-                    current_item = app.browser.drums
-                elif path_parts[0].lower() == "audio_effects":
-                    current_item = app.browser.audio_effects
-                elif path_parts[0].lower() == "midi_effects":
-                    current_item = app.browser.midi_effects
-                else:
+                if root_name not in _BROWSER_ROOTS:
                     # Default to instruments if not specified
-                    current_item = app.browser.instruments
                     # Don't skip the first part in this case
-                    path_parts = ["instruments"] + path_parts
+                    if root_name:
+                        folder_parts = (root_name,) + folder_parts
+                    root_name = "instruments"
+                current_item = getattr(browser, root_name)
                 
                 # Navigate through the path
-                for i in range(1, len(path_parts)):
-                    part = path_parts[i]
-                    if not part:  # Skip empty parts
-                        continue
-                    
-                    found = False
-                    for child in current_item.children:
-                        if child.name.lower() == part.lower():
-                            current_item = child
-                            found = True
-                            break
-                    
-                    if not found:
+                for part in folder_parts:
+                    child = self._find_child_by_name(current_item, part)
+                    if child is None:
                         result["error"] = "Path part '{0}' not found".format(part)
                         return result
+                    current_item = child
                 
                 # Found the item
                 result["found"] = True
@@ -794,7 +1083,8 @@ class AbletonMCP(ControlSurface):
             return result
         except Exception as e:
             self.log_message("Error getting browser item: " + str(e))
-            self.log_message(traceback.format_exc())
+            if self._debug:
+                self.log_message(traceback.format_exc())
             raise   
     
     
@@ -806,10 +1096,10 @@ class AbletonMCP(ControlSurface):
             track = self._get_track_by_index(track_index)
             
             # Access the application's browser instance instead of creating a new one
-            app = self.application()
+            browser = self._get_browser()
             
             # Find the browser item by URI
-            item = self._find_browser_item_by_uri(app.browser, item_uri)
+            item = self._find_browser_item_by_uri(browser, item_uri)
             
             if not item:
                 raise ValueError("Browser item with URI '{0}' not found".format(item_uri))
@@ -818,7 +1108,7 @@ class AbletonMCP(ControlSurface):
             self._song.view.selected_track = track
             
             # Load the item
-            app.browser.load_item(item)
+            browser.load_item(item)
             
             result = {
                 "loaded": True,
@@ -829,60 +1119,257 @@ class AbletonMCP(ControlSurface):
             return result
         except Exception as e:
             self.log_message("Error loading browser item: {0}".format(str(e)))
-            self.log_message(traceback.format_exc())
+            if self._debug:
+                self.log_message(traceback.format_exc())
             raise
     
-    def _find_browser_item_by_uri(self, browser_or_item, uri, max_depth=10, current_depth=0):
-        """Find a browser item by its URI"""
-        try:
-            # Check if this is the item we're looking for
-            if hasattr(browser_or_item, 'uri') and browser_or_item.uri == uri:
-                return browser_or_item
-            
-            # Stop recursion if we've reached max depth
-            if current_depth >= max_depth:
-                return None
-            
-            # Check if this is a browser with root categories
-            if hasattr(browser_or_item, 'instruments'):
-                # Check all main categories
-                categories = [
-                    browser_or_item.instruments,
-                    browser_or_item.sounds,
-                    browser_or_item.drums,
-                    browser_or_item.audio_effects,
-                    browser_or_item.midi_effects
-                ]
-                
-                for category in categories:
-                    item = self._find_browser_item_by_uri(category, uri, max_depth, current_depth + 1)
-                    if item:
-                        return item
-                
-                return None
+    def _get_browser(self):
+        """Get Live's browser, cached after the first lookup"""
+        browser = self._browser
+        if browser is None:
+            app = self.application()
+            if not app:
+                raise RuntimeError("Could not access Live application")
             
-            # Check if this item has children
-            if hasattr(browser_or_item, 'children') and browser_or_item.children:
-                for child in browser_or_item.children:
-                    item = self._find_browser_item_by_uri(child, uri, max_depth, current_depth + 1)
-                    if item:
+            # Check if browser is available
+            browser = getattr(app, 'browser', None)
+            if browser is None:
+                raise RuntimeError("Browser is not available in the Live application")
+            self._browser = browser
+        return browser
+    
+    def _get_browser_attrs(self, browser):
+        """Get the browser's public attribute names as a sorted tuple"""
+        # Attributes come from the class, so the type is a stable cache key
+        key = type(browser)
+        attrs = self._browser_attrs_cache.get(key)
+        if attrs is None:
+            attrs = tuple(attr for attr in dir(browser) if not attr.startswith('_'))
+            self._browser_attrs_cache[key] = attrs
+            # Log available browser attributes to help diagnose issues
+            self.log_message("Available browser attributes: {0}".format(list(attrs)))
+        return attrs
+    
+    def _find_child_by_name(self, item, name):
+        """Find a direct child of a browser item by case-insensitive name"""
+        name = name.lower()
+        uri = getattr(item, 'uri', None)
+        children = self._browser_children.get(uri) if uri else None
+        if children is not None:
+            child = children.get(name)
+            if child is not None:
+                return child
+        
+        # Build (or rebuild, in case the folder's contents changed) the index
+        children = {}
+        for child in item.children:
+            child_name = getattr(child, 'name', None)
+            if child_name is not None:
+                # The first child with a given name wins, as with a linear scan
+                children.setdefault(child_name.lower(), child)
+        if uri:
+            self._browser_children[uri] = children
+        return children.get(name)
+    
+    def _find_browser_item_by_uri(self, browser_or_item, uri, max_depth=10):
+        """Find a browser item by its URI (breadth-first, so shallow items are found first)"""
+        try:
+            item = self._uri_to_item.get(uri)
+            if item is not None:
+                # The cached item may have been removed from the browser since
+                try:
+                    if item.uri == uri:
                         return item
+                except Exception:
+                    pass
+                self._uri_to_item.pop(uri, None)
+            
+            # Search only the category the URI's namespace points at first
+            if uri and hasattr(browser_or_item, 'instruments'):
+                match = _URI_NAMESPACE.match(uri)
+                root_name = _URI_NAMESPACE_ROOTS.get(match.group(1).lower()) if match else None
+                if root_name:
+                    root = getattr(browser_or_item, root_name)
+                    # Categories sit one level below the browser
+                    for item, item_uri in self._walk_browser(root, max_depth - 1):
+                        if item_uri == uri:
+                            return item
+            
+            # Unknown namespace, or not where expected: search every category
+            for item, item_uri in self._walk_browser(browser_or_item, max_depth):
+                if item_uri == uri:
+                    return item
             
             return None
         except Exception as e:
             self.log_message("Error finding browser item by URI: {0}".format(str(e)))
             return None
     
+    def _walk_browser(self, browser_or_item, max_depth=10):
+        """Yield (item, uri) for a browser subtree breadth-first, remembering every item by URI"""
+        # Check if this is a browser with root categories
+        if hasattr(browser_or_item, 'instruments'):
+            queue = collections.deque((category, 1) for category in (
+                browser_or_item.instruments,
+                browser_or_item.sounds,
+                browser_or_item.drums,
+                browser_or_item.audio_effects,
+                browser_or_item.midi_effects
+            ))
+        else:
+            queue = collections.deque([(browser_or_item, 0)])
+        
+        seen = self._uri_to_item
+        popleft = queue.popleft
+        extend = queue.extend
+        while queue:
+            item, depth = popleft()
+            
+            item_uri = getattr(item, 'uri', None)
+            if item_uri and len(seen) < BROWSER_URI_CACHE_SIZE:
+                seen[item_uri] = item
+            yield item, item_uri
+            
+            # Don't descend past max depth
+            if depth >= max_depth:
+                continue
+            
+            try:
+                children = getattr(item, 'children', None)
+                if children:
+                    extend((child, depth + 1) for child in children)
+            except Exception as e:
+                # Skip an unreadable subtree rather than abandoning the walk
+                self.log_message("Error reading browser item children: {0}".format(str(e)))
+    
+    def _index_browser_slice(self):
+        """Walk the next slice of the browser into the URI cache (runs on Live's main thread)"""
+        try:
+            walk = self._browser_index_walk
+            if walk is None:
+                walk = self._browser_index_walk = self._walk_browser(self._get_browser())
+                self._browser_index_start = time.time()
+            
+            done = True
+            if self.running and len(self._uri_to_item) < BROWSER_URI_CACHE_SIZE:
+                for _ in range(BROWSER_INDEX_SLICE):
+                    if next(walk, None) is None:
+                        break
+                else:
+                    done = False
+            
+            if not done:
+                self.schedule_message(1, self._index_browser_slice)
+                return
+            
+            self._browser_index_walk = None
+            if self.running:
+                self.log_message("Indexed {0} browser items in {1:.1f}s".format(
+                    len(self._uri_to_item), time.time() - self._browser_index_start))
+        except Exception as e:
+            self._browser_index_walk = None
+            self.log_message("Error indexing browser: {0}".format(str(e)))
+    
     # Helper methods
     
+    @contextlib.contextmanager
+    def _undo_step(self, enabled=True):
+        """Group the Live changes made inside the block into a single undo step
+        
+        Inside another undo step (e.g. a set_eq_band within apply_batch) the
+        changes simply join the outer step instead of nesting a new one. Undo
+        steps only open on the main thread, so a plain depth counter suffices.
+        """
+        if not enabled or self._undo_depth:
+            yield
+            return
+        self._undo_depth += 1
+        self._song.begin_undo_step()
+        try:
+            yield
+        finally:
+            self._song.end_undo_step()
+            self._undo_depth -= 1
+    
+    def _get_param_map(self, device):
+        """Get a name -> parameter map for a device, cached across commands"""
+        return self._get_param_maps(device)[0]
+    
+    def _get_param_maps(self, device, rebuild=False):
+        """Build or fetch the cached (name -> parameter, name -> index) maps for a device"""
+        parameters = device.parameters
+        key = getattr(device, "_live_ptr", None)
+        # The first parameter's pointer catches a new device reusing a freed pointer
+        check = (len(parameters), getattr(parameters[0], "_live_ptr", None) if parameters else None)
+        if key is not None and not rebuild:
+            entry = self._device_param_cache.get(key)
+            if entry is not None and entry[0] == check:
+                return entry[1]
+        
+        # The first parameter with a given name wins, as with a linear scan
+        param_map = {}
+        index_map = {}
+        for index, param in enumerate(parameters):
+            name = param.name
+            if name not in param_map:
+                param_map[name] = param
+                index_map[name] = index
+        maps = (param_map, index_map)
+        
+        if key is not None:
+            if len(self._device_param_cache) >= DEVICE_PARAM_CACHE_SIZE:
+                self._device_param_cache.clear()
+            self._device_param_cache[key] = (check, maps)
+        return maps
+    
+    def _find_param(self, device, name):
+        """Find a device parameter and its index by name, or (None, None)"""
+        param_map, index_map = self._get_param_maps(device)
+        param = param_map.get(name)
+        if param is None or param.name != name:
+            # Renaming a parameter (e.g. mapping a rack macro) doesn't change
+            # what the cache is checked by, so rebuild (in case it was renamed)
+            param_map, index_map = self._get_param_maps(device, rebuild=True)
+            param = param_map.get(name)
+            if param is None:
+                return None, None
+        return param, index_map[name]
+    
+    def _require_param(self, device, name):
+        """Get a device parameter by name, raising if it doesn't exist"""
+        param = self._find_param(device, name)[0]
+        if param is None:
+            raise ValueError(f"Parameter '{name}' not found")
+        return param
+    
+    def _get_value_items(self, param, value_items=None):
+        """Get (names, lowercase name -> index) for a quantized parameter's value items"""
+        if value_items is None:
+            value_items = param.value_items
+        key = getattr(param, "_live_ptr", None)
+        if key is not None:
+            entry = self._value_item_cache.get(key)
+            if entry is not None and len(entry[0]) == len(value_items):
+                return entry
+        
+        names = tuple(str(item) for item in value_items)
+        index_by_name = {}
+        for i, name in enumerate(names):
+            # The first matching item wins, as with a linear scan
+            index_by_name.setdefault(name.lower(), i)
+        entry = (names, index_by_name)
+        
+        if key is not None:
+            if len(self._value_item_cache) >= VALUE_ITEM_CACHE_SIZE:
+                self._value_item_cache.clear()
+            self._value_item_cache[key] = entry
+        return entry
+    
     def _get_device_type(self, device):
         """Get the type of a device"""
-        if device.class_name == "PluginDevice":
-            return "plugin"
-        elif device.class_name == "InstrumentGroupDevice":
-            return "instrument_rack"
-        elif device.class_name == "DrumGroupDevice":
-            return "drum_rack"
+        device_type = _DEVICE_CLASS_TYPES.get(device.class_name)
+        if device_type:
+            return device_type
         elif device.can_have_drum_pads:
             return "drum_device"
         elif device.can_have_chains:
@@ -896,31 +1383,37 @@ class AbletonMCP(ControlSurface):
             # Get the track using the helper function that handles return tracks
             track = self._get_track_by_index(track_index)
             
-            if device_index < 0 or device_index >= len(track.devices):
-                raise IndexError("Device index out of range")
-            
-            device = track.devices[device_index]
+            device = self._get_device_by_index(track, device_index)
             
             # Get all parameters for the device
             parameters = []
+            get_value_items = self._get_value_items
             for param_index, param in enumerate(device.parameters):
                 # Skip parameters that are not automatable or are just for display
-                if not param.is_enabled or param.is_quantized and len(param.value_items) <= 1:
+                if not param.is_enabled:
                     continue
+                is_quantized = param.is_quantized
+                if is_quantized:
+                    value_items = param.value_items
+                    if len(value_items) <= 1:
+                        continue
                 
+                value = param.value
                 param_info = {
                     "index": param_index,
                     "name": param.name,
-                    "value": param.value,
+                    "value": value,
                     "min": param.min,
                     "max": param.max,
                 }
                 
                 # Add value items for quantized parameters (e.g., filter types)
-                if param.is_quantized and len(param.value_items) > 1:
-                    param_info["value_items"] = [str(item) for item in param.value_items]
-                    param_info["value_item_index"] = int(param.value)
-                    param_info["value_item"] = str(param.value_items[int(param.value)])
+                if is_quantized:
+                    names = get_value_items(param, value_items)[0]
+                    item_index = int(value)
+                    param_info["value_items"] = list(names)
+                    param_info["value_item_index"] = item_index
+                    param_info["value_item"] = names[item_index]
                 
                 parameters.append(param_info)
             
@@ -932,7 +1425,8 @@ class AbletonMCP(ControlSurface):
             }
         except Exception as e:
             self.log_message("Error getting device parameters: " + str(e))
-            self.log_message(traceback.format_exc())
+            if self._debug:
+                self.log_message(traceback.format_exc())
             raise
     
     def _set_device_parameter(self, track_index, device_index, parameter_name=None, parameter_index=None, value=None):
@@ -941,93 +1435,123 @@ class AbletonMCP(ControlSurface):
             # Get the track using the helper function that handles return tracks
             track = self._get_track_by_index(track_index)
             
-            if device_index < 0 or device_index >= len(track.devices):
-                raise IndexError("Device index out of range")
-            
-            device = track.devices[device_index]
-            
-            # Find the parameter by name or index
-            parameter = None
-            if parameter_name is not None:
-                # Find parameter by name
-                for param in device.parameters:
-                    if param.name == parameter_name:
-                        parameter = param
-                        break
-                
-                if parameter is None:
-                    raise ValueError(f"Parameter '{parameter_name}' not found in device '{device.name}'")
+            device = self._get_device_by_index(track, device_index)
             
-            elif parameter_index is not None:
-                # Find parameter by index
-                if parameter_index < 0 or parameter_index >= len(device.parameters):
-                    raise IndexError("Parameter index out of range")
-                
-                parameter = device.parameters[parameter_index]
-            
-            else:
-                raise ValueError("Either parameter_name or parameter_index must be provided")
-            
-            # Check if the parameter is enabled
-            if not parameter.is_enabled:
-                raise ValueError(f"Parameter '{parameter.name}' is not enabled")
-            
-            # Set the parameter value
-            if value is None:
-                raise ValueError("Value must be provided")
-            
-            # Handle quantized parameters (e.g., filter types)
-            if parameter.is_quantized and len(parameter.value_items) > 1:
-                # If value is a string, find the matching value item
-                if isinstance(value, str):
-                    value_index = None
-                    for i, item in enumerate(parameter.value_items):
-                        if str(item).lower() == value.lower():
-                            value_index = i
-                            break
-                    
-                    if value_index is None:
-                        raise ValueError(f"Value '{value}' not found in parameter value items")
-                    
-                    value = value_index
-                
-                # Ensure value is an integer for quantized parameters
-                value = int(value)
-                
-                # Check if value is in range
-                if value < 0 or value >= len(parameter.value_items):
-                    raise ValueError(f"Value index {value} out of range for parameter '{parameter.name}'")
-            else:
-                # For continuous parameters, ensure value is within range
-                if value < parameter.min or value > parameter.max:
-                    raise ValueError(f"Value {value} out of range for parameter '{parameter.name}' (min: {parameter.min}, max: {parameter.max})")
+            return self._apply_device_parameter(device, parameter_name, parameter_index, value)
+        except Exception as e:
+            self.log_message("Error setting device parameter: " + str(e))
+            if self._debug:
+                self.log_message(traceback.format_exc())
+            raise
+    
+    def _set_device_parameters_batch(self, track_index, device_index, updates):
+        """Set several parameters of one device in a single command
+        
+        Args:
+            track_index: Index of the track
+            device_index: Index of the device on the track
+            updates: List of {"parameter_name" or "parameter_index", "value"} dicts
+        
+        Returns:
+            Dictionary with one result per update, in order; an update that
+            fails gets {"error": message} and the rest are still applied
+        """
+        try:
+            track = self._get_track_by_index(track_index)
+            device = self._get_device_by_index(track, device_index)
             
-            # Set the parameter value
-            parameter.value = value
+            results = []
+            with self._undo_step(len(updates) > 1):
+                for update in updates:
+                    try:
+                        results.append(self._apply_device_parameter(
+                            device, update.get("parameter_name", None),
+                            update.get("parameter_index", None), update.get("value", None)))
+                    except Exception as e:
+                        results.append({"error": str(e)})
             
             return {
                 "device_name": device.name,
-                "parameter_name": parameter.name,
-                "parameter_index": list(device.parameters).index(parameter),
-                "value": parameter.value,
-                "min": parameter.min,
-                "max": parameter.max
+                "results": results
             }
         except Exception as e:
-            self.log_message("Error setting device parameter: " + str(e))
-            self.log_message(traceback.format_exc())
+            self.log_message("Error setting device parameters: " + str(e))
+            if self._debug:
+                self.log_message(traceback.format_exc())
             raise
     
+    def _apply_device_parameter(self, device, parameter_name, parameter_index, value):
+        """Set one parameter of a device by name or index"""
+        # Find the parameter by name or index
+        parameter = None
+        if parameter_name is not None:
+            # Find parameter by name
+            parameter, parameter_index = self._find_param(device, parameter_name)
+            
+            if parameter is None:
+                raise ValueError(f"Parameter '{parameter_name}' not found in device '{device.name}'")
+        
+        elif parameter_index is not None:
+            # Find parameter by index
+            parameters = device.parameters
+            if parameter_index < 0 or parameter_index >= len(parameters):
+                raise IndexError("Parameter index out of range")
+            
+            parameter = parameters[parameter_index]
+        
+        else:
+            raise ValueError("Either parameter_name or parameter_index must be provided")
+        
+        # Check if the parameter is enabled
+        if not parameter.is_enabled:
+            raise ValueError(f"Parameter '{parameter.name}' is not enabled")
+        
+        # Set the parameter value
+        if value is None:
+            raise ValueError("Value must be provided")
+        
+        # Handle quantized parameters (e.g., filter types)
+        value_items = parameter.value_items if parameter.is_quantized else ()
+        if len(value_items) > 1:
+            # If value is a string, find the matching value item
+            if isinstance(value, str):
+                value_index = self._get_value_items(parameter, value_items)[1].get(value.lower())
+                
+                if value_index is None:
+                    raise ValueError(f"Value '{value}' not found in parameter value items")
+                
+                value = value_index
+            
+            # Ensure value is an integer for quantized parameters
+            value = int(value)
+            
+            # Check if value is in range
+            if value < 0 or value >= len(value_items):
+                raise ValueError(f"Value index {value} out of range for parameter '{parameter.name}'")
+        else:
+            # For continuous parameters, ensure value is within range
+            if value < parameter.min or value > parameter.max:
+                raise ValueError(f"Value {value} out of range for parameter '{parameter.name}' (min: {parameter.min}, max: {parameter.max})")
+        
+        # Set the parameter value
+        parameter.value = value
+        
+        return {
+            "device_name": device.name,
+            "parameter_name": parameter.name,
+            "parameter_index": parameter_index,
+            "value": parameter.value,
+            "min": parameter.min,
+            "max": parameter.max
+        }
+    
     def _set_eq_band(self, track_index, device_index, band_index, frequency=None, gain=None, q=None, filter_type=None):
         """Set parameters for a specific band in an EQ Eight device"""
         try:
             # Get the track and device
             track = self._get_track_by_index(track_index)
             
-            if device_index < 0 or device_index >= len(track.devices):
-                raise IndexError("Device index out of range")
-            
-            device = track.devices[device_index]
+            device = self._get_device_by_index(track, device_index)
             
             # Verify this is an EQ Eight device
             if "EQ Eight" not in device.name:
@@ -1037,127 +1561,86 @@ class AbletonMCP(ControlSurface):
             if band_index < 0 or band_index > 7:
                 raise ValueError("Band index must be between 0 and 7")
             
-            # Convert band_index (0-7) to the actual band number (1-8)
-            band_number = band_index + 1
+            band_param_names = _EQ_BAND_PARAM_NAMES[band_index]
             
             # Set parameters as requested
             results = {}
             
-            # Set frequency if provided
-            if frequency is not None:
-                freq_param_name = f"{band_number} Frequency A"
-                freq_param = None
-                
-                # Find the frequency parameter
-                for param in device.parameters:
-                    if param.name == freq_param_name:
-                        freq_param = param
-                        break
-                
-                if freq_param is None:
-                    raise ValueError(f"Parameter '{freq_param_name}' not found")
-                
-                # Convert frequency value (Hz) to normalized value (0-1)
-                # This is a rough approximation, as the actual mapping is logarithmic
-                # For more precise control, we would need to implement the exact mapping function
-                # that Ableton uses, but this should work for basic functionality
-                if frequency < 20:
-                    frequency = 20  # Minimum frequency
-                if frequency > 20000:
-                    frequency = 20000  # Maximum frequency
-                
-                # Convert to logarithmic scale (approximation)
-                log_min = math.log10(20)  # 20 Hz
-                log_max = math.log10(20000)  # 20 kHz
-                log_freq = math.log10(frequency)
-                normalized_value = (log_freq - log_min) / (log_max - log_min)
-                
-                freq_param.value = normalized_value
-                results["frequency"] = frequency
-            
-            # Set gain if provided
-            if gain is not None:
-                gain_param_name = f"{band_number} Gain A"
-                gain_param = None
-                
-                # Find the gain parameter
-                for param in device.parameters:
-                    if param.name == gain_param_name:
-                        gain_param = param
-                        break
-                
-                if gain_param is None:
-                    raise ValueError(f"Parameter '{gain_param_name}' not found")
-                
-                gain_param.value = gain
-                results["gain"] = gain
-            
-            # Set Q if provided
-            if q is not None:
-                q_param_name = f"{band_number} Resonance A"
-                q_param = None
-                
-                # Find the Q parameter
-                for param in device.parameters:
-                    if param.name == q_param_name:
-                        q_param = param
-                        break
-                
-                if q_param is None:
-                    raise ValueError(f"Parameter '{q_param_name}' not found")
-                
-                # Convert Q value to normalized value (0-1)
-                # This is a rough approximation
-                normalized_q = q / 10.0  # Assuming max Q is around 10
-                if normalized_q > 1.0:
-                    normalized_q = 1.0
-                
-                q_param.value = normalized_q
-                results["q"] = q
-            
-            # Set filter type if provided
-            if filter_type is not None:
-                filter_param_name = f"{band_number} Filter Type A"
-                filter_param = None
-                
-                # Find the filter type parameter
-                for param in device.parameters:
-                    if param.name == filter_param_name:
-                        filter_param = param
-                        break
+            # Setting several parameters at once should undo as one step
+            changes = sum(x is not None for x in (frequency, gain, q, filter_type))
+            with self._undo_step(changes > 1):
+                # Set frequency if provided
+                if frequency is not None:
+                    # Find the frequency parameter
+                    freq_param = self._require_param(device, band_param_names["freq"])
+                    
+                    # Convert frequency value (Hz) to normalized value (0-1)
+                    # This is a rough approximation, as the actual mapping is logarithmic
+                    # For more precise control, we would need to implement the exact mapping function
+                    # that Ableton uses, but this should work for basic functionality
+                    frequency = min(20000, max(20, frequency))  # Clamp to 20 Hz - 20 kHz
+                    
+                    # Convert to logarithmic scale (approximation)
+                    normalized_value = (math.log10(frequency) - _LOG_FREQ_MIN) / _LOG_FREQ_SPAN
+                    
+                    freq_param.value = normalized_value
+                    results["frequency"] = frequency
                 
-                if filter_param is None:
-                    raise ValueError(f"Parameter '{filter_param_name}' not found")
+                # Set gain if provided
+                if gain is not None:
+                    # Find the gain parameter
+                    gain_param = self._require_param(device, band_param_names["gain"])
+                    
+                    gain_param.value = gain
+                    results["gain"] = gain
                 
-                # Handle filter type as string or index
-                if isinstance(filter_type, str):
-                    # Find the matching filter type
-                    filter_index = None
-                    for i, item in enumerate(filter_param.value_items):
-                        if str(item).lower() == filter_type.lower():
-                            filter_index = i
-                            break
+                # Set Q if provided
+                if q is not None:
+                    # Find the Q parameter
+                    q_param = self._require_param(device, band_param_names["q"])
                     
-                    if filter_index is None:
-                        raise ValueError(f"Filter type '{filter_type}' not found")
+                    # Convert Q value to normalized value (0-1)
+                    # This is a rough approximation
+                    normalized_q = q / 10.0  # Assuming max Q is around 10
+                    if normalized_q > 1.0:
+                        normalized_q = 1.0
                     
-                    filter_param.value = filter_index
-                    results["filter_type"] = str(filter_param.value_items[filter_index])
-                else:
-                    # Assume filter_type is an index
-                    if filter_type < 0 or filter_type >= len(filter_param.value_items):
-                        raise ValueError(f"Filter type index {filter_type} out of range")
+                    q_param.value = normalized_q
+                    results["q"] = q
+                
+                # Set filter type if provided
+                if filter_type is not None:
+                    # Find the filter type parameter
+                    filter_param = self._require_param(device, band_param_names["type"])
                     
-                    filter_param.value = filter_type
-                    results["filter_type"] = str(filter_param.value_items[filter_type])
-            
+                    # Handle filter type as string or index
+                    if isinstance(filter_type, str):
+                        # Find the matching filter type
+                        names, index_by_name = self._get_value_items(filter_param)
+                        filter_index = index_by_name.get(filter_type.lower())
+                        
+                        if filter_index is None:
+                            raise ValueError(f"Filter type '{filter_type}' not found")
+                        
+                        filter_param.value = filter_index
+                        results["filter_type"] = names[filter_index]
+                    else:
+                        # Assume filter_type is an index
+                        names = self._get_value_items(filter_param)[0]
+                        if filter_type < 0 or filter_type >= len(names):
+                            raise ValueError(f"Filter type index {filter_type} out of range")
+                        
+                        filter_param.value = filter_type
+                        results["filter_type"] = names[filter_type]
+                
             return {
                 "band_index": band_index,
                 "parameters": results
             }
         except Exception as e:
             self.log_message("Error setting EQ band parameters: " + str(e))
-            self.log_message(traceback.format_exc())
+            if self._debug:
+                self.log_message(traceback.format_exc())
             raise
     
     def _set_eq_global(self, track_index, device_index, scale=None, mode=None, oversampling=None):
@@ -1166,30 +1649,21 @@ class AbletonMCP(ControlSurface):
             # Get the track and device
             track = self._get_track_by_index(track_index)
             
-            if device_index < 0 or device_index >= len(track.devices):
-                raise IndexError("Device index out of range")
-            
-            device = track.devices[device_index]
+            device = self._get_device_by_index(track, device_index)
             
             # Verify this is an EQ Eight device
             if "EQ Eight" not in device.name:
                 raise ValueError(f"Device at index {device_index} is not an EQ Eight device")
             
+            param_map = self._get_param_map(device)
+            
             # Set parameters as requested
             results = {}
             
             # Set scale if provided
             if scale is not None:
-                scale_param = None
-                
                 # Find the scale parameter
-                for param in device.parameters:
-                    if param.name == "Scale":
-                        scale_param = param
-                        break
-                
-                if scale_param is None:
-                    raise ValueError("Scale parameter not found")
+                scale_param = self._require_param(device, "Scale")
                 
                 scale_param.value = scale
                 results["scale"] = scale
@@ -1201,8 +1675,8 @@ class AbletonMCP(ControlSurface):
                 mode_param = None
                 
                 # Try to find a parameter that might be the mode
-                for param in device.parameters:
-                    if "Mode" in param.name:
+                for name, param in param_map.items():
+                    if "Mode" in name:
                         mode_param = param
                         break
                 
@@ -1212,24 +1686,22 @@ class AbletonMCP(ControlSurface):
                 # Handle mode as string or index
                 if isinstance(mode, str):
                     # Find the matching mode
-                    mode_index = None
-                    for i, item in enumerate(mode_param.value_items):
-                        if str(item).lower() == mode.lower():
-                            mode_index = i
-                            break
+                    names, index_by_name = self._get_value_items(mode_param)
+                    mode_index = index_by_name.get(mode.lower())
                     
                     if mode_index is None:
                         raise ValueError(f"Mode '{mode}' not found")
                     
                     mode_param.value = mode_index
-                    results["mode"] = str(mode_param.value_items[mode_index])
+                    results["mode"] = names[mode_index]
                 else:
                     # Assume mode is an index
-                    if mode < 0 or mode >= len(mode_param.value_items):
+                    names = self._get_value_items(mode_param)[0]
+                    if mode < 0 or mode >= len(names):
                         raise ValueError(f"Mode index {mode} out of range")
                     
                     mode_param.value = mode
-                    results["mode"] = str(mode_param.value_items[mode])
+                    results["mode"] = names[mode]
             
             # Set oversampling if provided - Note: EQ Eight doesn't seem to have an "Oversampling" parameter
             # We'll leave this in but it will likely fail
@@ -1237,8 +1709,8 @@ class AbletonMCP(ControlSurface):
                 # Try to find a parameter that might be oversampling
                 oversampling_param = None
                 
-                for param in device.parameters:
-                    if "Oversampling" in param.name or "Hi Quality" in param.name:
+                for name, param in param_map.items():
+                    if "Oversampling" in name or "Hi Quality" in name:
                         oversampling_param = param
                         break
                 
@@ -1255,7 +1727,8 @@ class AbletonMCP(ControlSurface):
             }
         except Exception as e:
             self.log_message("Error setting EQ global parameters: " + str(e))
-            self.log_message(traceback.format_exc())
+            if self._debug:
+                self.log_message(traceback.format_exc())
             raise
     
     def _apply_eq_preset(self, track_index, device_index, preset_type):
@@ -1264,186 +1737,81 @@ class AbletonMCP(ControlSurface):
             # Get the track and device
             track = self._get_track_by_index(track_index)
             
-            if device_index < 0 or device_index >= len(track.devices):
-                raise IndexError("Device index out of range")
-            
-            device = track.devices[device_index]
+            device = self._get_device_by_index(track, device_index)
             
             # Verify this is an EQ Eight device
             if "EQ Eight" not in device.name:
                 raise ValueError(f"Device at index {device_index} is not an EQ Eight device")
             
-            # Define presets
-            presets = {
-                "low_cut": {
-                    0: {"enabled": True, "freq": 80, "gain": 0, "q": 0.7, "type": "High Pass 48dB"}
-                },
-                "high_cut": {
-                    7: {"enabled": True, "freq": 10000, "gain": 0, "q": 0.7, "type": "Low Pass 48dB"}
-                },
-                "low_shelf": {
-                    0: {"enabled": True, "freq": 100, "gain": -3, "q": 0.7, "type": "Low Shelf"}
-                },
-                "high_shelf": {
-                    7: {"enabled": True, "freq": 8000, "gain": -3, "q": 0.7, "type": "High Shelf"}
-                },
-                "bell": {
-                    3: {"enabled": True, "freq": 1000, "gain": 0, "q": 1.0, "type": "Bell"}
-                },
-                "notch": {
-                    3: {"enabled": True, "freq": 1000, "gain": -12, "q": 8.0, "type": "Notch"}
-                },
-                "flat": {
-                    # Reset all bands to default values
-                    0: {"enabled": False},
-                    1: {"enabled": False},
-                    2: {"enabled": False},
-                    3: {"enabled": False},
-                    4: {"enabled": False},
-                    5: {"enabled": False},
-                    6: {"enabled": False},
-                    7: {"enabled": False}
-                }
-            }
-            
-            if preset_type not in presets:
-                raise ValueError(f"Unknown preset type '{preset_type}'. Available presets: {', '.join(presets.keys())}")
-            
-            preset = presets[preset_type]
+            preset = _EQ_PRESETS.get(preset_type)
+            if preset is None:
+                raise ValueError(f"Unknown preset type '{preset_type}'. Available presets: {_EQ_PRESET_NAMES}")
             applied_settings = {}
             
-            # Apply preset settings
-            for band_index, settings in preset.items():
-                band_settings = {}
-                band_number = band_index + 1  # Convert to 1-based index for parameter names
-                
-                # Enable/disable the band
-                if "enabled" in settings:
-                    enable_param_name = f"{band_number} Filter On A"
-                    enable_param = None
-                    
-                    # Find the enable parameter
-                    for param in device.parameters:
-                        if param.name == enable_param_name:
-                            enable_param = param
-                            break
-                    
-                    if enable_param is None:
-                        raise ValueError(f"Parameter '{enable_param_name}' not found")
-                    
-                    enable_value = 1 if settings["enabled"] else 0
-                    enable_param.value = enable_value
-                    band_settings["enabled"] = settings["enabled"]
-                
-                # Only set other parameters if the band is enabled
-                if settings.get("enabled", False):
-                    # Set frequency if provided
-                    if "freq" in settings:
-                        freq_param_name = f"{band_number} Frequency A"
-                        freq_param = None
-                        
-                        # Find the frequency parameter
-                        for param in device.parameters:
-                            if param.name == freq_param_name:
-                                freq_param = param
-                                break
-                        
-                        if freq_param is None:
-                            raise ValueError(f"Parameter '{freq_param_name}' not found")
-                        
-                        # Convert frequency to normalized value (0-1)
-                        frequency = settings["freq"]
-                        if frequency < 20:
-                            frequency = 20  # Minimum frequency
-                        if frequency > 20000:
-                            frequency = 20000  # Maximum frequency
-                        
-                        # Convert to logarithmic scale (approximation)
-                        log_min = math.log10(20)  # 20 Hz
-                        log_max = math.log10(20000)  # 20 kHz
-                        log_freq = math.log10(frequency)
-                        normalized_value = (log_freq - log_min) / (log_max - log_min)
-                        
-                        freq_param.value = normalized_value
-                        band_settings["freq"] = frequency
+            # The whole preset undoes as one step
+            with self._undo_step():
+                # Apply preset settings, looking up only the parameters each band uses
+                for band_index, settings in preset.items():
+                    band_settings = {}
+                    band_param_names = _EQ_BAND_PARAM_NAMES[band_index]
+                    enabled = settings.get("enabled", False)
                     
-                    # Set gain if provided
-                    if "gain" in settings:
-                        gain_param_name = f"{band_number} Gain A"
-                        gain_param = None
-                        
-                        # Find the gain parameter
-                        for param in device.parameters:
-                            if param.name == gain_param_name:
-                                gain_param = param
-                                break
-                        
-                        if gain_param is None:
-                            raise ValueError(f"Parameter '{gain_param_name}' not found")
-                        
-                        gain_param.value = settings["gain"]
-                        band_settings["gain"] = settings["gain"]
+                    # Enable/disable the band
+                    if "enabled" in settings:
+                        self._require_param(device, band_param_names["enable"]).value = 1 if enabled else 0
+                        band_settings["enabled"] = enabled
                     
-                    # Set Q if provided
-                    if "q" in settings:
-                        q_param_name = f"{band_number} Resonance A"
-                        q_param = None
-                        
-                        # Find the Q parameter
-                        for param in device.parameters:
-                            if param.name == q_param_name:
-                                q_param = param
-                                break
+                    # Only set other parameters if the band is enabled
+                    if enabled:
+                        # Set frequency if provided
+                        if "freq" in settings:
+                            freq_param = self._require_param(device, band_param_names["freq"])
+                            
+                            # Convert frequency to normalized value (0-1)
+                            frequency = settings["freq"]
+                            frequency = min(20000, max(20, frequency))  # Clamp to 20 Hz - 20 kHz
+                            
+                            # Convert to logarithmic scale (approximation)
+                            freq_param.value = (math.log10(frequency) - _LOG_FREQ_MIN) / _LOG_FREQ_SPAN
+                            band_settings["freq"] = frequency
                         
-                        if q_param is None:
-                            raise ValueError(f"Parameter '{q_param_name}' not found")
+                        # Set gain if provided
+                        if "gain" in settings:
+                            self._require_param(device, band_param_names["gain"]).value = settings["gain"]
+                            band_settings["gain"] = settings["gain"]
                         
-                        # Convert Q value to normalized value (0-1)
-                        normalized_q = settings["q"] / 10.0  # Assuming max Q is around 10
-                        if normalized_q > 1.0:
-                            normalized_q = 1.0
+                        # Set Q if provided
+                        if "q" in settings:
+                            # Convert Q value to normalized value (0-1), assuming max Q is around 10
+                            self._require_param(device, band_param_names["q"]).value = min(settings["q"] / 10.0, 1.0)
+                            band_settings["q"] = settings["q"]
                         
-                        q_param.value = normalized_q
-                        band_settings["q"] = settings["q"]
+                        # Set filter type if provided
+                        if "type" in settings:
+                            filter_param = self._require_param(device, band_param_names["type"])
+                            
+                            # Handle filter type as string
+                            filter_type = settings["type"]
+                            names, index_by_name = self._get_value_items(filter_param)
+                            filter_index = index_by_name.get(filter_type.lower())
+                            
+                            if filter_index is None:
+                                raise ValueError(f"Filter type '{filter_type}' not found")
+                            
+                            filter_param.value = filter_index
+                            band_settings["type"] = names[filter_index]
                     
-                    # Set filter type if provided
-                    if "type" in settings:
-                        filter_param_name = f"{band_number} Filter Type A"
-                        filter_param = None
-                        
-                        # Find the filter type parameter
-                        for param in device.parameters:
-                            if param.name == filter_param_name:
-                                filter_param = param
-                                break
-                        
-                        if filter_param is None:
-                            raise ValueError(f"Parameter '{filter_param_name}' not found")
-                        
-                        # Handle filter type as string
-                        filter_type = settings["type"]
-                        filter_index = None
-                        for i, item in enumerate(filter_param.value_items):
-                            if str(item).lower() == filter_type.lower():
-                                filter_index = i
-                                break
-                        
-                        if filter_index is None:
-                            raise ValueError(f"Filter type '{filter_type}' not found")
-                        
-                        filter_param.value = filter_index
-                        band_settings["type"] = str(filter_param.value_items[filter_index])
+                    if band_settings:
+                        applied_settings[_EQ_BAND_RESULT_KEYS[band_index]] = band_settings
                 
-                if band_settings:
-                    applied_settings[f"band_{band_index}"] = band_settings
-            
             return {
                 "preset_type": preset_type,
                 "applied_settings": applied_settings
             }
         except Exception as e:
             self.log_message("Error applying EQ preset: " + str(e))
-            self.log_message(traceback.format_exc())
+            if self._debug:
+                self.log_message(traceback.format_exc())
             raise
     
     def get_browser_tree(self, category_type="all"):
@@ -1458,22 +1826,14 @@ class AbletonMCP(ControlSurface):
         """
         try:
             # Access the application's browser instance instead of creating a new one
-            app = self.application()
-            if not app:
-                raise RuntimeError("Could not access Live application")
-                
-            # Check if browser is available
-            if not hasattr(app, 'browser') or app.browser is None:
-                raise RuntimeError("Browser is not available in the Live application")
+            browser = self._get_browser()
             
-            # Log available browser attributes to help diagnose issues
-            browser_attrs = [attr for attr in dir(app.browser) if not attr.startswith('_')]
-            self.log_message("Available browser attributes: {0}".format(browser_attrs))
+            browser_attrs = self._get_browser_attrs(browser)
             
             result = {
                 "type": category_type,
                 "categories": [],
-                "available_categories": browser_attrs
+                "available_categories": list(browser_attrs)
             }
             
             # Helper function to process a browser item and its children
@@ -1481,77 +1841,44 @@ class AbletonMCP(ControlSurface):
                 if not item:
                     return None
                 
+                # One getattr per field instead of a hasattr probe plus a second read
                 result = {
-                    "name": item.name if hasattr(item, 'name') else "Unknown",
-                    "is_folder": hasattr(item, 'children') and bool(item.children),
-                    "is_device": hasattr(item, 'is_device') and item.is_device,
-                    "is_loadable": hasattr(item, 'is_loadable') and item.is_loadable,
-                    "uri": item.uri if hasattr(item, 'uri') else None,
-                    "children": []
+                    "name": getattr(item, 'name', "Unknown"),
+                    "is_folder": bool(getattr(item, 'children', None)),
+                    "is_device": getattr(item, 'is_device', False),
+                    "is_loadable": getattr(item, 'is_loadable', False),
+                    "uri": getattr(item, 'uri', None)
                 }
                 
-                
                 return result
             
             # Process based on category type and available attributes
-            if (category_type == "all" or category_type == "instruments") and hasattr(app.browser, 'instruments'):
-                try:
-                    instruments = process_item(app.browser.instruments)
-                    if instruments:
-                        instruments["name"] = "Instruments"  # Ensure consistent naming
-                        result["categories"].append(instruments)
-                except Exception as e:
-                    self.log_message("Error processing instruments: {0}".format(str(e)))
-            
-            if (category_type == "all" or category_type == "sounds") and hasattr(app.browser, 'sounds'):
-                try:
-                    sounds = process_item(app.browser.sounds)
-                    if sounds:
-                        sounds["name"] = "Sounds"  # Ensure consistent naming
-                        result["categories"].append(sounds)
-                except Exception as e:
-                    self.log_message("Error processing sounds: {0}".format(str(e)))
-            
-            if (category_type == "all" or category_type == "drums") and hasattr(app.browser, 'drums'):
-                try:
-                    drums = process_item(app.browser.drums)
-                    if drums:
-                        drums["name"] = "Drums"  # Ensure consistent naming
-                        result["categories"].append(drums)
-                except Exception as e:
-                    self.log_message("Error processing drums: {0}".format(str(e)))
-            
-            if (category_type == "all" or category_type == "audio_effects") and hasattr(app.browser, 'audio_effects'):
-                try:
-                    audio_effects = process_item(app.browser.audio_effects)
-                    if audio_effects:
-                        audio_effects["name"] = "Audio Effects"  # Ensure consistent naming
-                        result["categories"].append(audio_effects)
-                except Exception as e:
-                    self.log_message("Error processing audio_effects: {0}".format(str(e)))
-            
-            if (category_type == "all" or category_type == "midi_effects") and hasattr(app.browser, 'midi_effects'):
+            for attr, display_name in _BROWSER_ROOT_NAMES:
+                if category_type != "all" and category_type != attr:
+                    continue
                 try:
-                    midi_effects = process_item(app.browser.midi_effects)
-                    if midi_effects:
-                        midi_effects["name"] = "MIDI Effects"
-                        result["categories"].append(midi_effects)
+                    category = process_item(getattr(browser, attr, None))
+                    if category:
+                        category["name"] = display_name  # Ensure consistent naming
+                        result["categories"].append(category)
                 except Exception as e:
-                    self.log_message("Error processing midi_effects: {0}".format(str(e)))
+                    self.log_message("Error processing {0}: {1}".format(attr, str(e)))
             
             # Try to process other potentially available categories
-            for attr in browser_attrs:
-                if attr not in ['instruments', 'sounds', 'drums', 'audio_effects', 'midi_effects'] and \
-                   (category_type == "all" or category_type == attr):
-                    try:
-                        item = getattr(app.browser, attr)
-                        if hasattr(item, 'children') or hasattr(item, 'name'):
-                            category = process_item(item)
-                            if category:
-                                category["name"] = attr.capitalize()
-                                result["categories"].append(category)
-                    except Exception as e:
-                        self.log_message("Error processing {0}: {1}".format(attr, str(e)))
+            # (a request for one of the standard roots was fully handled above)
+            if category_type == "all" or category_type not in _BROWSER_ROOTS:
+                for attr in browser_attrs:
+                    if attr not in _BROWSER_ROOTS and \
+                       (category_type == "all" or category_type == attr):
+                        try:
+                            item = getattr(browser, attr)
+                            if hasattr(item, 'children') or hasattr(item, 'name'):
+                                category = process_item(item)
+                                if category:
+                                    category["name"] = attr.capitalize()
+                                    result["categories"].append(category)
+                        except Exception as e:
+                            self.log_message("Error processing {0}: {1}".format(attr, str(e)))
             
             self.log_message("Browser tree generated for {0} with {1} root categories".format(
                 category_type, len(result['categories'])))
@@ -1559,7 +1886,8 @@ class AbletonMCP(ControlSurface):
             
         except Exception as e:
             self.log_message("Error getting browser tree: {0}".format(str(e)))
-            self.log_message(traceback.format_exc())
+            if self._debug:
+                self.log_message(traceback.format_exc())
             raise
     
     def get_browser_items_at_path(self, path):
@@ -1576,45 +1904,22 @@ class AbletonMCP(ControlSurface):
         """
         try:
             # Access the application's browser instance instead of creating a new one
-            app = self.application()
-            if not app:
-                raise RuntimeError("Could not access Live application")
-                
-            # Check if browser is available
-            if not hasattr(app, 'browser') or app.browser is None:
-                raise RuntimeError("Browser is not available in the Live application")
+            browser = self._get_browser()
             
-            # Log available browser attributes to help diagnose issues
-            browser_attrs = [attr for attr in dir(app.browser) if not attr.startswith('_')]
-            self.log_message("Available browser attributes: {0}".format(browser_attrs))
+            browser_attrs = self._get_browser_attrs(browser)
                 
-            # Parse the path
-            path_parts = path.split("/")
-            if not path_parts:
-                raise ValueError("Invalid path")
-            
-            # Determine the root category
-            root_category = path_parts[0].lower()
-            current_item = None
+            # Parse the path into the root category and the folders below it
+            root_category, folder_parts = _split_browser_path(path)
             
             # Check standard categories first
-            if root_category == "instruments" and hasattr(app.browser, 'instruments'):
-                current_item = app.browser.instruments
-            elif root_category == "sounds" and hasattr(app.browser, 'sounds'):
-                current_item = app.browser.sounds
-            elif root_category == "drums" and hasattr(app.browser, 'drums'):
-                current_item = app.browser.drums
-            elif root_category == "audio_effects" and hasattr(app.browser, 'audio_effects'):
-                current_item = app.browser.audio_effects
-            elif root_category == "midi_effects" and hasattr(app.browser, 'midi_effects'):
-                current_item = app.browser.midi_effects
-            else:
+            current_item = getattr(browser, root_category, None) if root_category in _BROWSER_ROOTS else None
+            if current_item is None:
                 # Try to find the category in other browser attributes
                 found = False
                 for attr in browser_attrs:
                     if attr.lower() == root_category:
                         try:
-                            current_item = getattr(app.browser, attr)
+                            current_item = getattr(browser, attr)
                             found = True
                             break
                         except Exception as e:
@@ -1625,36 +1930,28 @@ class AbletonMCP(ControlSurface):
                     return {
                         "path": path,
                         "error": "Unknown or unavailable category: {0}".format(root_category),
-                        "available_categories": browser_attrs,
+                        "available_categories": list(browser_attrs),
                         "items": []
                     }
             
             # Navigate through the path
-            for i in range(1, len(path_parts)):
-                part = path_parts[i]
-                if not part:  # Skip empty parts
-                    continue
-                
+            for i, part in enumerate(folder_parts):
                 if not hasattr(current_item, 'children'):
                     return {
                         "path": path,
-                        "error": "Item at '{0}' has no children".format('/'.join(path_parts[:i])),
+                        "error": "Item at '{0}' has no children".format(
+                            '/'.join((root_category,) + folder_parts[:i])),
                         "items": []
                     }
                 
-                found = False
-                for child in current_item.children:
-                    if hasattr(child, 'name') and child.name.lower() == part.lower():
-                        current_item = child
-                        found = True
-                        break
-                
-                if not found:
+                child = self._find_child_by_name(current_item, part)
+                if child is None:
                     return {
                         "path": path,
                         "error": "Path part '{0}' not found".format(part),
                         "items": []
                     }
+                current_item = child
             
             # Get items at the current path
             items = []
@@ -1684,7 +1981,8 @@ class AbletonMCP(ControlSurface):
             
         except Exception as e:
             self.log_message("Error getting browser items at path: {0}".format(str(e)))
-            self.log_message(traceback.format_exc())
+            if self._debug:
+                self.log_message(traceback.format_exc())
             raise
     
     def _set_send_level(self, track_index, send_index, value):
@@ -1694,27 +1992,29 @@ class AbletonMCP(ControlSurface):
             track = self._get_track_by_index(track_index)
             
             # Return tracks don't have sends, so make sure this is a regular track
-            if track_index >= len(self._song.tracks):
+            if track_index >= len(self._tracks):
                 raise ValueError("Return tracks don't have sends")
             
             # Verify the send index is valid
-            if send_index < 0 or send_index >= len(track.mixer_device.sends):
+            sends = track.mixer_device.sends
+            if send_index < 0 or send_index >= len(sends):
                 raise IndexError("Send index out of range")
             
             # Get the send and set its value
-            send = track.mixer_device.sends[send_index]
+            send = sends[send_index]
             send.value = value
             
             result = {
                 "track_name": track.name,
                 "send_index": send_index,
-                "return_track_name": self._song.return_tracks[send_index].name,
+                "return_track_name": self._return_tracks[send_index].name,
                 "value": send.value
             }
             return result
         except Exception as e:
             self.log_message("Error setting send level: " + str(e))
-            self.log_message(traceback.format_exc())
+            if self._debug:
+                self.log_message(traceback.format_exc())
             raise
     
     def _set_track_volume(self, track_index, value):
@@ -1732,19 +2032,54 @@ class AbletonMCP(ControlSurface):
             track = self._get_track_by_index(track_index)
             
             # Set the volume value (0.0 to 1.0)
-            track.mixer_device.volume.value = value
+            volume = track.mixer_device.volume
+            volume.value = value
+            new_value = volume.value
             
             result = {
                 "track_name": track.name,
-                "volume": track.mixer_device.volume.value,
-                "volume_db": self._linear_to_db(track.mixer_device.volume.value)
+                "volume": new_value,
+                "volume_db": self._linear_to_db(new_value)
             }
             return result
         except Exception as e:
             self.log_message("Error setting track volume: " + str(e))
-            self.log_message(traceback.format_exc())
+            if self._debug:
+                self.log_message(traceback.format_exc())
             raise
     
+    def _apply_batch(self, commands):
+        """Apply a list of mixer and device updates in one pass
+        
+        Args:
+            commands: List of {"type": ..., "params": {...}} updates, using the
+                same types and params as the individual commands
+        
+        Returns:
+            Dictionary with the result of each update, in order. The batch is
+            not atomic: an update that fails gets {"error": message}, its index
+            is listed in "failed", and the other updates are still applied
+        """
+        # Resolve every handler up front so a bad entry fails before anything changes
+        handlers = []
+        for i, command in enumerate(commands):
+            command_type = command.get("type", "")
+            handler = self._BATCH_HANDLERS.get(command_type)
+            if handler is None:
+                raise ValueError("Unsupported batch command at {0}: {1}".format(i, command_type))
+            handlers.append((handler, command.get("params", {})))
+        
+        results = []
+        failed = []
+        with self._undo_step(len(handlers) > 1):
+            for i, (handler, params) in enumerate(handlers):
+                try:
+                    results.append(handler(self, params))
+                except Exception as e:
+                    results.append({"error": str(e)})
+                    failed.append(i)
+        return {"count": len(results), "results": results, "failed": failed}
+    
     def _linear_to_db(self, value):
         """Convert a linear volume value (0.0 to 1.0) to dB
         
@@ -1756,19 +2091,17 @@ class AbletonMCP(ControlSurface):
         """
         # Add a small epsilon to prevent extreme negative values
         # when value is very close to zero but not exactly zero
-        epsilon = 1e-7
-        
-        if value <= epsilon:
-            return float('-inf')  # -infinity dB for zero or near-zero volume
+        if value <= _VOLUME_EPSILON:
+            return _NEG_INF  # -infinity dB for zero or near-zero volume
         
         # Ableton's volume mapping is approximately:
         # 0.85 -> 0dB
         # 0.0 -> -inf dB
         # 1.0 -> +6dB
         
-        if value < 0.85:
+        if value < _VOLUME_0DB:
             # Below 0dB
-            return 20 * math.log10(value / 0.85)
+            return 20 * math.log10(value * _INV_VOLUME_0DB)
         else:
             # Above 0dB (0.85 to 1.0 maps to 0dB to +6dB)
-            return 6 * (value - 0.85) / 0.15
\ No newline at end of file
+            return (value - _VOLUME_0DB) * _VOLUME_DB_SLOPE_ABOVE_0DB
\ No newline at end of file
@@ -59,13 +59,16 @@ class AbletonConnection:
                     
                     chunks.append(chunk)
                     
-                    # Check if we've received a complete JSON object
+                    # Check if we've received a complete JSON object. Parse the
+                    # bytes directly: a multibyte UTF-8 character split across
+                    # chunks fails to decode (UnicodeDecodeError, a ValueError)
+                    # just like incomplete JSON, and both mean keep receiving
                     try:
                         data = b''.join(chunks)
-                        json.loads(data.decode('utf-8'))
+                        json.loads(data)
                         logger.info(f"Received complete response ({len(data)} bytes)")
                         return data
-                    except json.JSONDecodeError:
+                    except ValueError:
                         # Incomplete JSON, continue receiving
                         continue
                 except socket.timeout:
@@ -83,9 +86,9 @@ class AbletonConnection:
             data = b''.join(chunks)
             logger.info(f"Returning data after receive completion ({len(data)} bytes)")
             try:
-                json.loads(data.decode('utf-8'))
+                json.loads(data)
                 return data
-            except json.JSONDecodeError:
+            except ValueError:
                 raise Exception("Incomplete JSON response received")
         else:
             raise Exception("No data received")
@@ -105,9 +108,9 @@ class AbletonConnection:
             "create_midi_track", "create_audio_track", "set_track_name",
             "create_clip", "add_notes_to_clip", "set_clip_name",
             "set_tempo", "fire_clip", "stop_clip", "start_playback", "stop_playback",
-            "load_browser_item", "load_drum_kit", "set_device_parameter",
+            "load_browser_item", "load_drum_kit", "set_device_parameter", "set_device_parameters_batch",
             "set_eq_band", "set_eq_global", "apply_eq_preset", "create_return_track",
-            "set_send_level", "set_track_volume"
+            "set_send_level", "set_track_volume", "apply_batch"
         ]
         
         try:
@@ -131,7 +134,7 @@ class AbletonConnection:
             logger.info(f"Received {len(response_data)} bytes of data")
             
             # Parse the response
-            response = json.loads(response_data.decode('utf-8'))
+            response = json.loads(response_data)
             logger.info(f"Response parsed, status: {response.get('status', 'unknown')}")
             
             if response.get("status") == "error":
@@ -733,6 +736,38 @@ def set_device_parameter(ctx: Context, track_index: int, device_index: int,
         logger.error(f"Error setting device parameter: {str(e)}")
         return f"Error setting device parameter: {str(e)}"
 
+@mcp.tool()
+def set_device_parameters(ctx: Context, track_index: int, device_index: int,
+                          updates: List[Dict[str, Union[str, int, float]]]) -> str:
+    """
+    Set several parameters of one device in a single command.
+    
+    Parameters:
+    - track_index: The index of the track containing the device
+    - device_index: The index of the device on the track
+    - updates: List of updates, each with "parameter_name" or "parameter_index" and "value"
+    
+    Returns:
+    - String with the result of the operation
+    """
+    try:
+        ableton = get_ableton_connection()
+        result = ableton.send_command("set_device_parameters_batch", {
+            "track_index": track_index,
+            "device_index": device_index,
+            "updates": updates
+        })
+        
+        results = result.get("results", [])
+        failed = [r["error"] for r in results if "error" in r]
+        summary = f"Set {len(results) - len(failed)} of {len(results)} parameters of device '{result.get('device_name', 'unknown')}'"
+        if failed:
+            summary += ". Errors: " + "; ".join(failed)
+        return summary
+    except Exception as e:
+        logger.error(f"Error setting device parameters: {str(e)}")
+        return f"Error setting device parameters: {str(e)}"
+
 @mcp.tool()
 def set_eq_band(ctx: Context, track_index: int, device_index: int, band_index: int,
                 frequency: Optional[float] = None, gain: Optional[float] = None,
@@ -1143,6 +1178,32 @@ def set_track_volume(ctx: Context, track_index: int, value: float) -> str:
         logger.error(f"Error setting track volume: {str(e)}")
         return f"Error setting track volume: {str(e)}"
 
+@mcp.tool()
+def apply_batch(ctx: Context, commands: List[Dict[str, Any]]) -> str:
+    """
+    Apply several mixer and device updates in a single round trip.
+    
+    Parameters:
+    - commands: List of updates, each {"type": ..., "params": {...}} where type is one of
+      "set_track_volume", "set_send_level", "set_device_parameter" or "set_eq_band" and
+      params are the same as for the individual tool
+    """
+    try:
+        ableton = get_ableton_connection()
+        result = ableton.send_command("apply_batch", {"commands": commands})
+        
+        # The batch isn't atomic: failed updates are reported, the rest applied
+        results = result.get("results", [])
+        failed = result.get("failed", [])
+        summary = f"Applied {len(results) - len(failed)} of {len(results)} updates in one batch"
+        if failed:
+            summary += ". Errors: " + "; ".join(
+                f"update {i} ({commands[i].get('type', '')}): {results[i].get('error', '')}" for i in failed)
+        return summary
+    except Exception as e:
+        logger.error(f"Error applying batch: {str(e)}")
+        return f"Error applying batch: {str(e)}"
+
 # Main execution
 def main():
     """Run the MCP server"""
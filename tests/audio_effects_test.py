@@ -5,15 +5,10 @@ This script tests parameter control for various audio effects to ensure
 the generic device parameter control implementation works across different devices.
 """
 
-import socket
-import json
-import time
+import concurrent.futures
 import sys
-import math
 
-# Connection settings
-HOST = "localhost"
-PORT = 9877
+from mcp_client import Connection, send_command, send_commands_batch
 
 def print_divider(title=""):
     """Print a divider with an optional title."""
@@ -22,56 +17,6 @@ def print_divider(title=""):
         print(f"{title.center(80)}")
     print("=" * 80)
 
-def send_command(command_type, params=None):
-    """Send a command to the MCP server and return the result."""
-    if params is None:
-        params = {}
-    
-    print(f"Sending command: {command_type}")
-    print(f"Parameters: {json.dumps(params, indent=2)}")
-    
-    try:
-        # Create a socket connection
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            # Connect to the server
-            sock.connect((HOST, PORT))
-            
-            # Prepare the command
-            command = {
-                "type": command_type,
-                "params": params
-            }
-            
-            # Send the command
-            sock.sendall(json.dumps(command).encode('utf-8'))
-            
-            # Receive the response
-            response = b""
-            while True:
-                chunk = sock.recv(4096)
-                if not chunk:
-                    break
-                response += chunk
-                
-                # Check if we've received a complete JSON response
-                try:
-                    json.loads(response.decode('utf-8'))
-                    break  # If we can parse it, we have a complete response
-                except json.JSONDecodeError:
-                    continue  # Keep receiving if the JSON is incomplete
-            
-            # Parse and return the response
-            try:
-                result = json.loads(response.decode('utf-8'))
-                print(f"Response: {json.dumps(result, indent=2)}")
-                return result
-            except json.JSONDecodeError:
-                print(f"Error decoding JSON response: {response.decode('utf-8')}")
-                return {"status": "error", "message": "Failed to decode response"}
-    except Exception as e:
-        print(f"Error sending command: {str(e)}")
-        return {"status": "error", "message": str(e)}
-
 def setup_test_track(track_name="Audio Effects Test Track"):
     """Set up a test track and return its index."""
     print_divider(f"SETTING UP TEST TRACK: {track_name}")
@@ -103,11 +48,12 @@ def load_device(track_index, device_uri, device_name):
         print("❌ Cannot load device without a valid track")
         return None
     
-    # Load the device onto the track
-    device_result = send_command("load_browser_item", {
-        "track_index": track_index,
-        "item_uri": device_uri
-    })
+    # Load the device onto the track and read back the track info to find the
+    # device index; the server handles them in order, so both go in one batch
+    device_result, track_info = send_commands_batch([
+        ("load_browser_item", {"track_index": track_index, "item_uri": device_uri}),
+        ("get_track_info", {"track_index": track_index}),
+    ])
     
     if device_result.get("status") != "success":
         print(f"❌ Failed to load {device_name}. Error: {device_result.get('message', 'Unknown error')}")
@@ -115,9 +61,6 @@ def load_device(track_index, device_uri, device_name):
     
     print(f"✅ Successfully loaded {device_name} onto the track")
     
-    # Get track info to find the device index
-    track_info = send_command("get_track_info", {"track_index": track_index})
-    
     if track_info.get("status") != "success" or "devices" not in track_info.get("result", {}):
         print("❌ Failed to get track info")
         return None
@@ -189,19 +132,22 @@ def test_device_parameters(track_index, device_index, device_name):
         param_min = param.get("min", 0)
         param_max = param.get("max", 1)
         
+        # Everything but the value is the same for each command in the sweep
+        base_params = {
+            "track_index": track_index,
+            "device_index": device_index,
+            "parameter_name": param_name
+        }
+        
         # For quantized parameters with value items, test setting to each value item
         if param.get("is_quantized", False) and "value_items" in param:
             value_items = param.get("value_items", [])
-            for i, item in enumerate(value_items):
+            results = send_commands_batch([("set_device_parameter", dict(base_params, value=i))
+                                           for i in range(len(value_items))])
+            
+            for (i, item), result in zip(enumerate(value_items), results):
                 print(f"\nTesting {param_name} = {item} (index {i})")
                 
-                result = send_command("set_device_parameter", {
-                    "track_index": track_index,
-                    "device_index": device_index,
-                    "parameter_name": param_name,
-                    "value": i
-                })
-                
                 if result.get("status") != "success":
                     print(f"❌ Failed to set {param_name} to {item}")
                     all_passed = False
@@ -218,16 +164,12 @@ def test_device_parameters(track_index, device_index, device_name):
         # For continuous parameters, test min, middle, and max values
         else:
             test_values = [param_min, (param_min + param_max) / 2, param_max]
-            for value in test_values:
+            results = send_commands_batch([("set_device_parameter", dict(base_params, value=value))
+                                           for value in test_values])
+            
+            for value, result in zip(test_values, results):
                 print(f"\nTesting {param_name} = {value}")
                 
-                result = send_command("set_device_parameter", {
-                    "track_index": track_index,
-                    "device_index": device_index,
-                    "parameter_name": param_name,
-                    "value": value
-                })
-                
                 if result.get("status") != "success":
                     print(f"❌ Failed to set {param_name} to {value}")
                     all_passed = False
@@ -291,16 +233,19 @@ def main():
     """Run all tests."""
     print_divider("ABLETON MCP AUDIO EFFECTS PARAMETER CONTROL TEST")
     
-    # Check if server is running
+    # Check if server is running; connecting is enough, no need for a command round trip
     print("\nChecking connection to MCP server...")
-    session_info = send_command("get_session_info")
-    if session_info.get("status") != "success":
+    try:
+        with Connection():
+            pass
+    except OSError:
         print("❌ Error: Failed to connect to MCP server")
         return 1
     
     print("✅ Successfully connected to MCP server")
     
-    # Run tests for each device type
+    # Run tests for each device type. Each test works on its own track,
+    # so they run concurrently, each thread on its own connection
     tests = [
         ("compressor", lambda: test_compressor(setup_test_track("Compressor Test Track"))),
         ("reverb", lambda: test_reverb(setup_test_track("Reverb Test Track"))),
@@ -308,15 +253,19 @@ def main():
         ("delay", lambda: test_delay(setup_test_track("Delay Test Track")))
     ]
     
-    results = {}
-    for name, test_func in tests:
+    def run_test(test):
+        name, test_func = test
         print(f"\nRunning test for {name}...")
         try:
-            result = test_func()
-            results[name] = result
+            # Release this worker's connection once its test is done
+            with Connection():
+                return test_func()
         except Exception as e:
             print(f"❌ Test failed with exception: {str(e)}")
-            results[name] = False
+            return False
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        results = dict(zip((name for name, _ in tests), executor.map(run_test, tests)))
     
     # Print summary
     print_divider("TEST SUMMARY")
@@ -8,14 +8,10 @@ This script tests:
 4. load_drum_kit
 """
 
-import socket
-import json
-import time
+import concurrent.futures
 import sys
 
-# Connection settings
-HOST = "localhost"
-PORT = 9877
+from mcp_client import Connection, connect, send_command
 
 def print_divider(title=""):
     """Print a divider with an optional title."""
@@ -24,56 +20,6 @@ def print_divider(title=""):
         print(f"{title.center(60)}")
     print("=" * 60)
 
-def send_command(command_type, params=None):
-    """Send a command to the MCP server and return the result."""
-    if params is None:
-        params = {}
-    
-    print(f"Sending command: {command_type}")
-    print(f"Parameters: {json.dumps(params, indent=2)}")
-    
-    try:
-        # Create a socket connection
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            # Connect to the server
-            sock.connect((HOST, PORT))
-            
-            # Prepare the command
-            command = {
-                "type": command_type,
-                "params": params
-            }
-            
-            # Send the command
-            sock.sendall(json.dumps(command).encode('utf-8'))
-            
-            # Receive the response
-            response = b""
-            while True:
-                chunk = sock.recv(4096)
-                if not chunk:
-                    break
-                response += chunk
-                
-                # Check if we've received a complete JSON response
-                try:
-                    json.loads(response.decode('utf-8'))
-                    break  # If we can parse it, we have a complete response
-                except json.JSONDecodeError:
-                    continue  # Keep receiving if the JSON is incomplete
-            
-            # Parse and return the response
-            try:
-                result = json.loads(response.decode('utf-8'))
-                print(f"Response: {json.dumps(result, indent=2)}")
-                return result
-            except json.JSONDecodeError:
-                print(f"Error decoding JSON response: {response.decode('utf-8')}")
-                return {"status": "error", "message": "Failed to decode response"}
-    except Exception as e:
-        print(f"Error sending command: {str(e)}")
-        return {"status": "error", "message": str(e)}
-
 def test_get_browser_tree():
     """Test the get_browser_tree command."""
     print_divider("TESTING GET BROWSER TREE")
@@ -98,17 +44,25 @@ def test_get_browser_items_at_path():
     """Test the get_browser_items_at_path command."""
     print_divider("TESTING GET BROWSER ITEMS AT PATH")
     
-    # Test with root paths
+    # Test with root paths. The queries only read the browser, so they run
+    # concurrently, each worker on its own connection
     root_paths = ["instruments", "audio_effects", "midi_effects", "drums", "sounds"]
+    
+    def get_items(path):
+        with Connection():
+            return send_command("get_browser_items_at_path", {"path": path})
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(root_paths)) as executor:
+        root_results = dict(zip(root_paths, executor.map(get_items, root_paths)))
+    
     for path in root_paths:
-        result = send_command("get_browser_items_at_path", {"path": path})
-        if result.get("status") != "success":
+        if root_results[path].get("status") != "success":
             print(f"❌ Failed to get browser items at path: {path}")
             return False
         print(f"✅ Successfully retrieved browser items at path: {path}")
     
     # Try to find a valid subpath for audio effects
-    result = send_command("get_browser_items_at_path", {"path": "audio_effects"})
+    result = root_results["audio_effects"]
     if result.get("status") == "success" and "items" in result.get("result", {}):
         items = result["result"]["items"]
         if items and len(items) > 0:
@@ -236,10 +190,11 @@ def main():
     """Run all tests."""
     print_divider("ABLETON MCP BROWSER & DEVICE MANAGEMENT TEST")
     
-    # Check if server is running
+    # Check if server is running; connecting is enough, and the tests reuse the connection
     print("\nChecking connection to MCP server...")
-    session_info = send_command("get_session_info")
-    if session_info.get("status") != "success":
+    try:
+        connect()
+    except OSError:
         print("❌ Error: Failed to connect to MCP server")
         return 1
     
@@ -0,0 +1,416 @@
+"""
+Shared client for the Ableton MCP test scripts.
+
+Commands go to the AbletonMCP Remote Script as bare JSON objects over TCP.
+Each thread keeps one connection open across commands, and responses are
+framed by bracket depth so each one is parsed exactly once.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import socket
+import sys
+import threading
+
+# orjson encodes straight to bytes and is much faster; ujson is a lighter
+# fallback where orjson isn't available, then the stdlib
+try:
+    import orjson
+    _dumps = orjson.dumps
+    
+    def _loads(data):
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            # The Remote Script writes -Infinity for silent volumes, which
+            # orjson rejects; the stdlib accepts it
+            return json.loads(data)
+    
+    def _pretty(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+except ImportError:
+    try:
+        import ujson
+        
+        def _dumps(obj):
+            return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode('utf-8')
+        
+        def _loads(data):
+            # ujson only takes str or bytes, not the bytearrays responses arrive in
+            try:
+                return ujson.loads(bytes(data))
+            except ValueError:
+                # Fall back to the stdlib for -Infinity, as with orjson
+                return json.loads(data)
+        
+        def _pretty(obj):
+            return ujson.dumps(obj, indent=2, escape_forward_slashes=False)
+    except ImportError:
+        # Compact separators keep the payload as small as the other codecs'
+        _encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        
+        def _dumps(obj):
+            return _encode(obj).encode('utf-8')
+        _loads = json.loads
+        
+        def _pretty(obj):
+            return json.dumps(obj, indent=2)
+
+# Log every command with its parameters and response, not just errors
+VERBOSE = os.environ.get("MCP_TEST_VERBOSE", "") not in ("", "0")
+
+# Client messages go to stdout alongside the test output; below the level
+# they aren't formatted at all
+log = logging.getLogger("mcp_test")
+log.setLevel(logging.DEBUG if VERBOSE else logging.WARNING)
+if not log.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(_handler)
+    log.propagate = False
+
+# Connection settings
+HOST = "localhost"
+PORT = 9877
+
+# Read size for responses; large browser trees arrive in far fewer recv calls
+RECV_SIZE = 65536
+
+# Minimum kernel send/receive buffer size for the client socket
+SOCKET_BUFFER_SIZE = 65536
+
+# Seconds to wait for the server to accept a connection
+CONNECT_TIMEOUT = 5.0
+
+# Most connections kept open for reuse after a Connection block ends
+IDLE_CONNECTIONS = 8
+
+# Commands that leave Live in the same state however often they run: reads,
+# and setters that write an absolute value. Only these are resent when a
+# connection drops after the command was sent, since the server may already
+# have run it; creating tracks or loading devices twice would duplicate them
+IDEMPOTENT_COMMANDS = frozenset([
+    "get_session_info", "get_track_info", "get_browser_item", "get_browser_categories",
+    "get_browser_items", "get_browser_tree", "get_browser_items_at_path",
+    "get_device_parameters", "set_track_name", "set_clip_name", "set_tempo",
+    "set_track_volume", "set_send_level", "set_device_parameter",
+    "set_device_parameters_batch", "set_eq_band", "set_eq_global",
+])
+
+# Bytes that open or close a JSON value or string
+_JSON_FRAME_TOKENS = re.compile(br'["\\{}\[\]]')
+
+class _JSONFrameScanner:
+    """Track bracket depth and string state across received chunks.
+    
+    Each chunk is scanned once, so a large response is parsed exactly once
+    after it is complete instead of being re-parsed after every recv.
+    """
+    
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.skip = 0  # Offset of the next unescaped byte in the next chunk
+    
+    def feed(self, chunk):
+        """Scan a new chunk and return the offset just past the end of the
+        top-level value, or -1 if it hasn't closed yet.
+        
+        After a value closes the scanner is ready for the next one, starting
+        with the rest of the chunk.
+        """
+        depth = self.depth
+        in_string = self.in_string
+        skip = self.skip
+        for match in _JSON_FRAME_TOKENS.finditer(chunk, skip):
+            pos = match.start()
+            if pos < skip:
+                continue  # Escaped by a preceding backslash
+            char = chunk[pos]
+            if in_string:
+                if char == 0x5C:  # Backslash, skip the escaped character
+                    skip = pos + 2
+                elif char == 0x22:
+                    in_string = False
+            elif char == 0x22:
+                in_string = True
+            elif char == 0x7B or char == 0x5B:
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    self.depth = 0
+                    self.in_string = False
+                    self.skip = 0
+                    return pos + 1
+        self.depth = depth
+        self.in_string = in_string
+        self.skip = max(skip - len(chunk), 0)
+        return -1
+
+# Each thread reuses its own connection, taking an idle one or opening a new
+# one on first use. Connections released by finished threads wait in _idle,
+# most recently used first, so worker threads don't reconnect for each task
+_local = threading.local()
+_connections = set()
+_connections_lock = threading.Lock()
+_idle = queue.LifoQueue(maxsize=IDLE_CONNECTIONS)
+
+def _open_connection():
+    """Open a new connection to the MCP server."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        # Commands are small; don't let Nagle hold them back waiting for an ACK
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # Size the buffers before connecting so the window is negotiated with
+        # them; only ever raise them, never shrink a larger system default
+        for option in (socket.SO_SNDBUF, socket.SO_RCVBUF):
+            if sock.getsockopt(socket.SOL_SOCKET, option) < SOCKET_BUFFER_SIZE:
+                sock.setsockopt(socket.SOL_SOCKET, option, SOCKET_BUFFER_SIZE)
+        # Fail rather than hang if the server isn't answering; commands
+        # themselves can take a while, so only the connect is bounded
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect((HOST, PORT))
+        sock.settimeout(None)
+    except OSError:
+        sock.close()
+        raise
+    with _connections_lock:
+        _connections.add(sock)
+    return sock
+
+def _acquire_connection():
+    """Return this thread's connection and whether it was already open."""
+    sock = getattr(_local, "sock", None)
+    if sock is not None:
+        return sock, True
+    try:
+        sock = _idle.get_nowait()
+        reused = True
+    except queue.Empty:
+        sock = _open_connection()
+        reused = False
+    _local.sock = sock
+    return sock, reused
+
+def _get_connection():
+    """Return this thread's connection to the MCP server, connecting if needed."""
+    return _acquire_connection()[0]
+
+def _release_connection():
+    """Hand this thread's connection back for reuse by other threads."""
+    sock = getattr(_local, "sock", None)
+    if sock is not None:
+        _local.sock = None
+        try:
+            _idle.put_nowait(sock)
+        except queue.Full:
+            with _connections_lock:
+                _connections.discard(sock)
+            sock.close()
+
+def _close_connection():
+    """Close this thread's connection; its next command reconnects."""
+    sock = getattr(_local, "sock", None)
+    if sock is not None:
+        _local.sock = None
+        with _connections_lock:
+            _connections.discard(sock)
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+def _close_all_connections():
+    """Close every thread's connection and the idle ones at exit."""
+    with _connections_lock:
+        socks = list(_connections)
+        _connections.clear()
+    for sock in socks:
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+atexit.register(_close_all_connections)
+
+def _receive_responses(sock, count):
+    """Read count back-to-back JSON responses and return the raw bytes of each.
+    
+    If the server closes the connection early, fewer responses are returned.
+    """
+    # Receive into this thread's reusable buffer and grow each response in
+    # place, so reading allocates nothing per chunk
+    view = getattr(_local, "recv_view", None)
+    if view is None:
+        view = _local.recv_view = memoryview(bytearray(RECV_SIZE))
+    
+    responses = []
+    response = bytearray()
+    scanner = _JSONFrameScanner()
+    while len(responses) < count:
+        n = sock.recv_into(view)
+        if not n:
+            # The server closed the connection
+            _close_connection()
+            break
+        
+        # Split off every response this chunk completes
+        chunk = view[:n]
+        while chunk:
+            end = scanner.feed(chunk)
+            if end < 0:
+                response.extend(chunk)
+                break
+            response.extend(chunk[:end])
+            responses.append(response)
+            response = bytearray()
+            chunk = chunk[end:]
+    if response and len(responses) < count:
+        # Keep a truncated response so the caller can report it
+        responses.append(response)
+    return responses
+
+def _exchange(payload, command_types):
+    """Send payload and read one response per command on this thread's connection.
+    
+    A reused connection may have been dropped while idle (for example when
+    Live reloads the Remote Script). If sending fails, the server never saw
+    the payload, so it is sent once more on a fresh connection. If the
+    connection drops after sending, the server may already have run the
+    commands, so they are only resent if all of them are idempotent.
+    """
+    count = len(command_types)
+    sock, reused = _acquire_connection()
+    try:
+        sock.sendall(payload)
+    except (BrokenPipeError, ConnectionResetError):
+        if not reused:
+            raise
+        return _resend(payload, count)
+    
+    retry = reused and IDEMPOTENT_COMMANDS.issuperset(command_types)
+    try:
+        responses = _receive_responses(sock, count)
+    except ConnectionResetError:
+        if not retry:
+            raise
+        responses = []
+    
+    if retry and not responses:
+        return _resend(payload, count)
+    return responses
+
+def _resend(payload, count):
+    """Send payload again on a fresh connection and read count responses."""
+    _close_connection()
+    sock = _get_connection()
+    sock.sendall(payload)
+    return _receive_responses(sock, count)
+
+def _log_response(result):
+    """Log a response in full at debug level."""
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Response: %s", _pretty(result))
+
+def send_command(command_type, params=None):
+    """Send a command to the MCP server and return the result."""
+    if params is None:
+        params = {}
+    
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Sending command: %s", command_type)
+        log.debug("Parameters: %s", _pretty(params))
+    
+    try:
+        # Prepare the command
+        command = {
+            "type": command_type,
+            "params": params
+        }
+        
+        # Send the command on this thread's connection and receive the response;
+        # responses are framed by the JSON itself
+        responses = _exchange(_dumps(command), (command_type,))
+        response = responses[0] if responses else bytearray()
+        
+        # Parse and return the response
+        try:
+            result = _loads(response)
+            _log_response(result)
+            return result
+        except ValueError:
+            # The stream is out of step with the server, start over on a new connection
+            _close_connection()
+            log.error("Error decoding JSON response: %s", response.decode('utf-8', 'replace'))
+            return {"status": "error", "message": "Failed to decode response"}
+    except Exception as e:
+        _close_connection()
+        log.error("Error sending command: %s", e)
+        return {"status": "error", "message": str(e)}
+
+def send_commands_batch(commands):
+    """Send several commands back-to-back and return their results in order.
+    
+    All commands are written before any response is read, so the batch costs
+    one round trip instead of one per command.
+    
+    Args:
+        commands: List of (command_type, params) tuples
+    """
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Sending batch of %d commands: %s", len(commands),
+                  ", ".join(sorted(set(t for t, _ in commands))))
+    
+    try:
+        payload = b"".join(_dumps({"type": command_type, "params": params})
+                           for command_type, params in commands)
+        responses = _exchange(payload, [command_type for command_type, _ in commands])
+    except Exception as e:
+        _close_connection()
+        log.error("Error sending command batch: %s", e)
+        return [{"status": "error", "message": str(e)} for _ in commands]
+    
+    results = []
+    for response in responses:
+        try:
+            result = _loads(response)
+            _log_response(result)
+            results.append(result)
+        except ValueError:
+            # The stream is out of step with the server, start over on a new connection
+            _close_connection()
+            log.error("Error decoding JSON response: %s", response.decode('utf-8', 'replace'))
+            results.append({"status": "error", "message": "Failed to decode response"})
+    while len(results) < len(commands):
+        results.append({"status": "error", "message": "Connection closed before all responses arrived"})
+    return results
+
+def connect():
+    """Open this thread's connection to the MCP server if it isn't open yet.
+    
+    Raises OSError if the server can't be reached. The connection stays open
+    for the commands that follow.
+    """
+    _get_connection()
+
+class Connection:
+    """Context manager scoping this thread's connection to a block.
+    
+    Commands sent inside the block share one connection. On exit it is kept
+    open for the next thread that needs one, or closed if the block raised.
+    """
+    
+    def __enter__(self):
+        return _get_connection()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            _release_connection()
+        else:
+            _close_connection()
+        return False
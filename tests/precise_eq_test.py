@@ -4,15 +4,10 @@ Precise EQ Testing Script for Ableton MCP.
 This script tests precise parameter control for the EQ Eight device.
 """
 
-import socket
-import json
-import time
 import sys
 import math
 
-# Connection settings
-HOST = "localhost"
-PORT = 9877
+from mcp_client import connect, send_command
 
 def print_divider(title=""):
     """Print a divider with an optional title."""
@@ -21,56 +16,6 @@ def print_divider(title=""):
         print(f"{title.center(60)}")
     print("=" * 60)
 
-def send_command(command_type, params=None):
-    """Send a command to the MCP server and return the result."""
-    if params is None:
-        params = {}
-    
-    print(f"Sending command: {command_type}")
-    print(f"Parameters: {json.dumps(params, indent=2)}")
-    
-    try:
-        # Create a socket connection
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            # Connect to the server
-            sock.connect((HOST, PORT))
-            
-            # Prepare the command
-            command = {
-                "type": command_type,
-                "params": params
-            }
-            
-            # Send the command
-            sock.sendall(json.dumps(command).encode('utf-8'))
-            
-            # Receive the response
-            response = b""
-            while True:
-                chunk = sock.recv(4096)
-                if not chunk:
-                    break
-                response += chunk
-                
-                # Check if we've received a complete JSON response
-                try:
-                    json.loads(response.decode('utf-8'))
-                    break  # If we can parse it, we have a complete response
-                except json.JSONDecodeError:
-                    continue  # Keep receiving if the JSON is incomplete
-            
-            # Parse and return the response
-            try:
-                result = json.loads(response.decode('utf-8'))
-                print(f"Response: {json.dumps(result, indent=2)}")
-                return result
-            except json.JSONDecodeError:
-                print(f"Error decoding JSON response: {response.decode('utf-8')}")
-                return {"status": "error", "message": "Failed to decode response"}
-    except Exception as e:
-        print(f"Error sending command: {str(e)}")
-        return {"status": "error", "message": str(e)}
-
 def setup_test_environment():
     """Set up the test environment by creating a track and loading an EQ Eight."""
     print_divider("SETTING UP TEST ENVIRONMENT")
@@ -127,6 +72,61 @@ def setup_test_environment():
     
     return track_index, device_index
 
+# Parameters per (track, device), keyed by name. Only the values change while
+# the tests run, and lookups only need names and value items
+_parameters_by_name = {}
+
+def get_parameters_by_name(track_index, device_index):
+    """Get a device's parameters keyed by name, fetching them once per device."""
+    key = (track_index, device_index)
+    by_name = _parameters_by_name.get(key)
+    if by_name is None:
+        params_result = send_command("get_device_parameters", {
+            "track_index": track_index,
+            "device_index": device_index
+        })
+        if params_result.get("status") != "success":
+            return {}
+        
+        by_name = {param.get("name"): param for param in params_result["result"]["parameters"]}
+        _parameters_by_name[key] = by_name
+    return by_name
+
+# Filter type indices per (track, device), keyed by filter type name
+_filter_type_indices = {}
+
+def get_filter_type_indices(track_index, device_index):
+    """Get the index of each EQ Eight filter type by name.
+    
+    Every band offers the same filter types, so band 1's list is used for all
+    of them and looked up once per device.
+    """
+    key = (track_index, device_index)
+    indices = _filter_type_indices.get(key)
+    if indices is None:
+        filter_type_param = get_parameters_by_name(track_index, device_index).get(_PARAM_NAMES[1]["type"], {})
+        indices = {item: i for i, item in enumerate(filter_type_param.get("value_items", []))}
+        _filter_type_indices[key] = indices
+    return indices
+
+def set_parameters_batch(track_index, device_index, updates):
+    """Set several parameters of one device with a single command.
+    
+    Returns one result per update, shaped like a set_device_parameter
+    response, so each can be checked the same way.
+    """
+    result = send_command("set_device_parameters_batch", {
+        "track_index": track_index,
+        "device_index": device_index,
+        "updates": updates
+    })
+    
+    if result.get("status") != "success":
+        return [result] * len(updates)
+    
+    return [{"status": "error", "message": r["error"]} if "error" in r else {"status": "success", "result": r}
+            for r in result["result"]["results"]]
+
 def frequency_to_normalized(freq_hz):
     """Convert frequency in Hz to normalized value (0-1)."""
     # EQ Eight frequency range is approximately 20Hz to 20kHz on a logarithmic scale
@@ -155,6 +155,91 @@ def normalized_to_q(normalized_value):
     # This is a rough approximation
     return round(normalized_value * 10, 2)
 
+# Test frequencies across the spectrum, gains and Q values, with the normalized
+# frequency and Q parameter values computed once rather than on every band
+TEST_FREQUENCIES = (50, 100, 200, 500, 1000, 2000, 5000, 10000)
+TEST_Q_VALUES = (0.3, 0.7, 1.0, 2.0, 5.0)
+TEST_GAINS = (-12, -6, -3, 0, 3, 6, 12)
+_NORMALIZED_FREQUENCIES = {freq: frequency_to_normalized(freq) for freq in TEST_FREQUENCIES}
+_NORMALIZED_Q_VALUES = {q: q_to_normalized(q) for q in TEST_Q_VALUES}
+
+# Bands exercised by the sweeps: bands 1, 3, 5, and 8
+TEST_BANDS = (0, 2, 4, 7)
+
+# EQ Eight parameter names for each band number (1 to 8), built once
+_PARAM_NAMES = {
+    band: {
+        "on": f"{band} Filter On A",
+        "type": f"{band} Filter Type A",
+        "frequency": f"{band} Frequency A",
+        "gain": f"{band} Gain A",
+        "q": f"{band} Resonance A",
+    }
+    for band in range(1, 9)
+}
+
+# Per-parameter sweep settings, keyed like _PARAM_NAMES: (label, unit, test
+# values, value to send for a test value, conversion of the value read back,
+# allowed error, whether the error is a percentage of the test value)
+SWEEP_SPECS = {
+    "frequency": ("frequency", " Hz", TEST_FREQUENCIES,
+                  _NORMALIZED_FREQUENCIES.__getitem__, normalized_to_frequency, 5, True),
+    "gain": ("gain", " dB", TEST_GAINS,
+             lambda gain: gain, lambda gain: gain, 0.01, False),
+    "q": ("Q", "", TEST_Q_VALUES,
+          _NORMALIZED_Q_VALUES.__getitem__, normalized_to_q, 10, True),
+}
+
+def run_band_sweep(track_index, device_index, band_number, spec_name):
+    """Sweep one parameter of a band through its test values and check each.
+    
+    The whole sweep is sent as one batch; returns True if every value was
+    set within the allowed error.
+    """
+    label, unit, values, to_sent, from_actual, max_error, relative = SWEEP_SPECS[spec_name]
+    parameter_name = _PARAM_NAMES[band_number][spec_name]
+    results = set_parameters_batch(track_index, device_index, [
+        {"parameter_name": parameter_name, "value": to_sent(value)}
+        for value in values
+    ])
+    
+    all_passed = True
+    for value, result in zip(values, results):
+        if result.get("status") != "success":
+            print(f"❌ Failed to set {label} for band {band_number} to {value}{unit}")
+            all_passed = False
+            continue
+        
+        # Convert the value that was actually set back to the parameter's units
+        actual = from_actual(result["result"]["value"])
+        
+        # Allow some error for rounding and the approximate conversions
+        error = abs(actual - value)
+        if relative:
+            error = error / value * 100
+        error_text = f"{error:.2f}%" if relative else f"{error:.2f}"
+        
+        if error < max_error:
+            print(f"✅ Set {label} for band {band_number} to {value}{unit} (actual: {actual}{unit}, error: {error_text})")
+        else:
+            print(f"⚠️ Set {label} for band {band_number} to {value}{unit}, but actual value is {actual}{unit} (error: {error_text})")
+            all_passed = False
+    
+    return all_passed
+
+def run_for_bands(band_test):
+    """Run band_test(band_number) for every test band, one after another.
+    
+    The bands are all on the same EQ Eight, so they run in order on this
+    thread's connection and each band's read-backs only see its own writes.
+    Returns True if every band passed.
+    """
+    all_passed = True
+    for band_index in TEST_BANDS:
+        if not band_test(band_index + 1):
+            all_passed = False
+    return all_passed
+
 def test_precise_frequency_control(track_index, device_index):
     """Test precise frequency control for EQ bands."""
     print_divider("TESTING PRECISE FREQUENCY CONTROL")
@@ -163,108 +248,55 @@ def test_precise_frequency_control(track_index, device_index):
         print("❌ Cannot test without track and device indices")
         return False
     
-    # Test frequencies across the spectrum
-    test_frequencies = [50, 100, 200, 500, 1000, 2000, 5000, 10000]
-    
-    # Test multiple bands to ensure they all work
-    test_bands = [0, 2, 4, 7]  # Bands 1, 3, 5, and 8
-    
-    all_passed = True
-    
-    for band_index in test_bands:
-        band_number = band_index + 1
+    def test_band(band_number):
         print(f"\n--- Testing Band {band_number} ---")
         
         # Enable the band
         result = send_command("set_device_parameter", {
             "track_index": track_index,
             "device_index": device_index,
-            "parameter_name": f"{band_number} Filter On A",
+            "parameter_name": _PARAM_NAMES[band_number]["on"],
             "value": 1  # 1 = On
         })
         
         if result.get("status") != "success":
             print(f"❌ Failed to enable band {band_number}")
-            all_passed = False
-            continue
+            return False
         
         print(f"✅ Enabled band {band_number}")
         
         # Set filter type to Bell
-        params_result = send_command("get_device_parameters", {
-            "track_index": track_index,
-            "device_index": device_index
-        })
-        
-        filter_type_param = None
-        for param in params_result["result"]["parameters"]:
-            if param.get("name") == f"{band_number} Filter Type A":
-                filter_type_param = param
-                break
+        filter_type_param = get_parameters_by_name(track_index, device_index).get(_PARAM_NAMES[band_number]["type"])
         
         if filter_type_param is None:
             print(f"❌ Could not find filter type parameter for band {band_number}")
-            all_passed = False
-            continue
+            return False
         
         # Find the index of the "Bell" filter type
         filter_type = "Bell"
-        filter_type_index = None
-        for i, item in enumerate(filter_type_param.get("value_items", [])):
-            if item == filter_type:
-                filter_type_index = i
-                break
+        filter_type_index = get_filter_type_indices(track_index, device_index).get(filter_type)
         
         if filter_type_index is None:
             print(f"❌ Could not find filter type '{filter_type}' for band {band_number}")
-            all_passed = False
-            continue
+            return False
         
         result = send_command("set_device_parameter", {
             "track_index": track_index,
             "device_index": device_index,
-            "parameter_name": f"{band_number} Filter Type A",
+            "parameter_name": _PARAM_NAMES[band_number]["type"],
             "value": filter_type_index
         })
         
         if result.get("status") != "success":
             print(f"❌ Failed to set filter type for band {band_number}")
-            all_passed = False
-            continue
+            return False
         
         print(f"✅ Set filter type for band {band_number} to {filter_type}")
         
         # Test each frequency
-        for freq in test_frequencies:
-            normalized_freq = frequency_to_normalized(freq)
-            
-            result = send_command("set_device_parameter", {
-                "track_index": track_index,
-                "device_index": device_index,
-                "parameter_name": f"{band_number} Frequency A",
-                "value": normalized_freq
-            })
-            
-            if result.get("status") != "success":
-                print(f"❌ Failed to set frequency for band {band_number} to {freq} Hz")
-                all_passed = False
-                continue
-            
-            # Get the actual normalized value that was set
-            actual_normalized = result["result"]["value"]
-            # Convert back to frequency
-            actual_freq = normalized_to_frequency(actual_normalized)
-            
-            # Calculate error percentage
-            error_pct = abs(actual_freq - freq) / freq * 100
-            
-            if error_pct < 5:  # Allow 5% error due to rounding and approximation
-                print(f"✅ Set frequency for band {band_number} to {freq} Hz (actual: {actual_freq} Hz, error: {error_pct:.2f}%)")
-            else:
-                print(f"⚠️ Set frequency for band {band_number} to {freq} Hz, but actual value is {actual_freq} Hz (error: {error_pct:.2f}%)")
-                all_passed = False
+        return run_band_sweep(track_index, device_index, band_number, "frequency")
     
-    return all_passed
+    return run_for_bands(test_band)
 
 def test_precise_gain_control(track_index, device_index):
     """Test precise gain control for EQ bands."""
@@ -274,45 +306,11 @@ def test_precise_gain_control(track_index, device_index):
         print("❌ Cannot test without track and device indices")
         return False
     
-    # Test gain values
-    test_gains = [-12, -6, -3, 0, 3, 6, 12]
-    
-    # Test multiple bands to ensure they all work
-    test_bands = [0, 2, 4, 7]  # Bands 1, 3, 5, and 8
-    
-    all_passed = True
-    
-    for band_index in test_bands:
-        band_number = band_index + 1
+    def test_band(band_number):
         print(f"\n--- Testing Band {band_number} ---")
-        
-        # Test each gain value
-        for gain in test_gains:
-            result = send_command("set_device_parameter", {
-                "track_index": track_index,
-                "device_index": device_index,
-                "parameter_name": f"{band_number} Gain A",
-                "value": gain
-            })
-            
-            if result.get("status") != "success":
-                print(f"❌ Failed to set gain for band {band_number} to {gain} dB")
-                all_passed = False
-                continue
-            
-            # Get the actual value that was set
-            actual_gain = result["result"]["value"]
-            
-            # Calculate error
-            error = abs(actual_gain - gain)
-            
-            if error < 0.01:  # Allow small error due to floating point precision
-                print(f"✅ Set gain for band {band_number} to {gain} dB (actual: {actual_gain} dB)")
-            else:
-                print(f"⚠️ Set gain for band {band_number} to {gain} dB, but actual value is {actual_gain} dB (error: {error:.2f})")
-                all_passed = False
+        return run_band_sweep(track_index, device_index, band_number, "gain")
     
-    return all_passed
+    return run_for_bands(test_band)
 
 def test_precise_q_control(track_index, device_index):
     """Test precise Q control for EQ bands."""
@@ -322,49 +320,11 @@ def test_precise_q_control(track_index, device_index):
         print("❌ Cannot test without track and device indices")
         return False
     
-    # Test Q values
-    test_q_values = [0.3, 0.7, 1.0, 2.0, 5.0]
-    
-    # Test multiple bands to ensure they all work
-    test_bands = [0, 2, 4, 7]  # Bands 1, 3, 5, and 8
-    
-    all_passed = True
-    
-    for band_index in test_bands:
-        band_number = band_index + 1
+    def test_band(band_number):
         print(f"\n--- Testing Band {band_number} ---")
-        
-        # Test each Q value
-        for q in test_q_values:
-            normalized_q = q_to_normalized(q)
-            
-            result = send_command("set_device_parameter", {
-                "track_index": track_index,
-                "device_index": device_index,
-                "parameter_name": f"{band_number} Resonance A",
-                "value": normalized_q
-            })
-            
-            if result.get("status") != "success":
-                print(f"❌ Failed to set Q for band {band_number} to {q}")
-                all_passed = False
-                continue
-            
-            # Get the actual normalized value that was set
-            actual_normalized = result["result"]["value"]
-            # Convert back to Q
-            actual_q = normalized_to_q(actual_normalized)
-            
-            # Calculate error percentage
-            error_pct = abs(actual_q - q) / q * 100
-            
-            if error_pct < 10:  # Allow 10% error due to approximation in our conversion
-                print(f"✅ Set Q for band {band_number} to {q} (actual: {actual_q}, error: {error_pct:.2f}%)")
-            else:
-                print(f"⚠️ Set Q for band {band_number} to {q}, but actual value is {actual_q} (error: {error_pct:.2f}%)")
-                all_passed = False
+        return run_band_sweep(track_index, device_index, band_number, "q")
     
-    return all_passed
+    return run_for_bands(test_band)
 
 def test_filter_types(track_index, device_index):
     """Test setting different filter types."""
@@ -374,52 +334,37 @@ def test_filter_types(track_index, device_index):
         print("❌ Cannot test without track and device indices")
         return False
     
-    # Test multiple bands to ensure they all work
-    test_bands = [0, 2, 4, 7]  # Bands 1, 3, 5, and 8
-    
-    all_passed = True
-    
-    for band_index in test_bands:
-        band_number = band_index + 1
+    def test_band(band_number):
         print(f"\n--- Testing Band {band_number} ---")
         
         # Get filter type parameter to find available options
-        params_result = send_command("get_device_parameters", {
-            "track_index": track_index,
-            "device_index": device_index
-        })
-        
-        filter_type_param = None
-        for param in params_result["result"]["parameters"]:
-            if param.get("name") == f"{band_number} Filter Type A":
-                filter_type_param = param
-                break
+        filter_type_param = get_parameters_by_name(track_index, device_index).get(_PARAM_NAMES[band_number]["type"])
         
         if filter_type_param is None:
             print(f"❌ Could not find filter type parameter for band {band_number}")
-            all_passed = False
-            continue
+            return False
         
         filter_types = filter_type_param.get("value_items", [])
         print(f"Available filter types for band {band_number}: {filter_types}")
         
-        # Test each filter type
-        for i, filter_type in enumerate(filter_types):
-            result = send_command("set_device_parameter", {
-                "track_index": track_index,
-                "device_index": device_index,
-                "parameter_name": f"{band_number} Filter Type A",
-                "value": i
-            })
-            
+        # Test each filter type, sending the whole sweep as one batch
+        results = set_parameters_batch(track_index, device_index, [
+            {"parameter_name": _PARAM_NAMES[band_number]["type"], "value": i}
+            for i in range(len(filter_types))
+        ])
+        
+        all_passed = True
+        for filter_type, result in zip(filter_types, results):
             if result.get("status") != "success":
                 print(f"❌ Failed to set filter type for band {band_number} to {filter_type}")
                 all_passed = False
                 continue
             
             print(f"✅ Set filter type for band {band_number} to {filter_type}")
+        
+        return all_passed
     
-    return all_passed
+    return run_for_bands(test_band)
 
 def test_scale_parameter(track_index, device_index):
     """Test the Scale parameter."""
@@ -462,10 +407,11 @@ def main():
     """Run all tests."""
     print_divider("ABLETON MCP PRECISE EQ PARAMETER CONTROL TEST")
     
-    # Check if server is running
+    # Check if server is running; connecting is enough, and the tests reuse the connection
     print("\nChecking connection to MCP server...")
-    session_info = send_command("get_session_info")
-    if session_info.get("status") != "success":
+    try:
+        connect()
+    except OSError:
         print("❌ Error: Failed to connect to MCP server")
         return 1
     
@@ -477,7 +423,9 @@ def main():
         print("❌ Failed to set up test environment")
         return 1
     
-    # Run tests
+    # Run tests. They all use the same EQ Eight on the same track, so they run
+    # in order: the frequency test sets the bands to Bell before gain and Q are
+    # tested, and the filter type test changes the band types under the others
     tests = [
         ("precise_frequency_control", lambda: test_precise_frequency_control(track_index, device_index)),
         ("precise_gain_control", lambda: test_precise_gain_control(track_index, device_index)),
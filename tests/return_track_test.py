@@ -4,14 +4,9 @@ Return Track Testing Script for Ableton MCP.
 This script tests the creation and manipulation of return tracks.
 """
 
-import socket
-import json
-import time
 import sys
 
-# Connection settings
-HOST = "localhost"
-PORT = 9877
+from mcp_client import connect, send_command, send_commands_batch
 
 def print_divider(title=""):
     """Print a divider with an optional title."""
@@ -20,62 +15,37 @@ def print_divider(title=""):
         print(f"{title.center(80)}")
     print("=" * 80)
 
-def send_command(command_type, params=None):
-    """Send a command to the MCP server and return the result."""
-    if params is None:
-        params = {}
-    
-    print(f"Sending command: {command_type}")
-    print(f"Parameters: {json.dumps(params, indent=2)}")
-    
-    try:
-        # Create a socket connection
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            # Connect to the server
-            sock.connect((HOST, PORT))
-            
-            # Prepare the command
-            command = {
-                "type": command_type,
-                "params": params
-            }
-            
-            # Send the command
-            sock.sendall(json.dumps(command).encode('utf-8'))
-            
-            # Receive the response
-            response = b""
-            while True:
-                chunk = sock.recv(4096)
-                if not chunk:
-                    break
-                response += chunk
-                
-                # Check if we've received a complete JSON response
-                try:
-                    json.loads(response.decode('utf-8'))
-                    break  # If we can parse it, we have a complete response
-                except json.JSONDecodeError:
-                    continue  # Keep receiving if the JSON is incomplete
-            
-            # Parse and return the response
-            try:
-                result = json.loads(response.decode('utf-8'))
-                print(f"Response: {json.dumps(result, indent=2)}")
-                return result
-            except json.JSONDecodeError:
-                print(f"Error decoding JSON response: {response.decode('utf-8')}")
-                return {"status": "error", "message": "Failed to decode response"}
-    except Exception as e:
-        print(f"Error sending command: {str(e)}")
-        return {"status": "error", "message": str(e)}
+# Track counts from the last session info, kept so each test doesn't re-fetch it
+_session_cache = {"track_count": None, "return_track_count": None}
+
+def get_track_counts():
+    """Get the (track_count, return_track_count) of the session.
+    
+    Uses the cached counts when a test already has them, otherwise fetches the
+    session info. Returns (None, None) if it can't be fetched.
+    """
+    if _session_cache["track_count"] is None:
+        session_info = send_command("get_session_info")
+        if session_info.get("status") != "success":
+            print("❌ Failed to get session info")
+            return None, None
+        _session_cache["track_count"] = session_info["result"]["track_count"]
+        _session_cache["return_track_count"] = session_info["result"]["return_track_count"]
+    return _session_cache["track_count"], _session_cache["return_track_count"]
 
 def test_create_return_track():
     """Test creating a return track."""
     print_divider("TESTING RETURN TRACK CREATION")
     
+    # Get the session info before and after creating a new return track. The
+    # server runs a connection's commands in order, so all three go in one batch
+    initial_session_info, result, updated_session_info = send_commands_batch([
+        ("get_session_info", {}),
+        ("create_return_track", {}),
+        ("get_session_info", {})
+    ])
+    
     # Get initial session info to see how many return tracks we have
-    initial_session_info = send_command("get_session_info")
     if initial_session_info.get("status") != "success":
         print("❌ Failed to get initial session info")
         return False
@@ -84,7 +54,6 @@ def test_create_return_track():
     print(f"Initial return track count: {initial_return_track_count}")
     
     # Create a new return track
-    result = send_command("create_return_track")
     if result.get("status") != "success":
         print("❌ Failed to create return track")
         return False
@@ -92,7 +61,6 @@ def test_create_return_track():
     print("✅ Successfully created return track")
     
     # Get updated session info to verify the return track was created
-    updated_session_info = send_command("get_session_info")
     if updated_session_info.get("status") != "success":
         print("❌ Failed to get updated session info")
         return False
@@ -105,26 +73,26 @@ def test_create_return_track():
         return False
     
     print("✅ Return track count increased as expected")
+    
+    # The following tests use the new return track
+    _session_cache["track_count"] = updated_session_info["result"]["track_count"]
+    _session_cache["return_track_count"] = updated_return_track_count
     return True
 
 def test_load_effect_on_return_track():
     """Test loading an effect onto a return track."""
     print_divider("TESTING LOADING EFFECT ON RETURN TRACK")
     
-    # Get session info to find the number of return tracks
-    session_info = send_command("get_session_info")
-    if session_info.get("status") != "success":
-        print("❌ Failed to get session info")
+    # Get the number of tracks and return tracks
+    track_count, return_track_count = get_track_counts()
+    if track_count is None:
         return False
     
-    return_track_count = session_info["result"]["return_track_count"]
     if return_track_count == 0:
         print("❌ No return tracks available for testing")
         return False
     
     # The return tracks are accessed using track indices after the regular tracks
-    track_count = session_info["result"]["track_count"]
-    
     # Use the last created return track instead of the first one
     # The index for return tracks is track_count + return_track_index
     return_track_index = return_track_count - 1  # Use the last return track
@@ -152,20 +120,16 @@ def test_set_return_track_name():
     """Test setting the name of a return track."""
     print_divider("TESTING SETTING RETURN TRACK NAME")
     
-    # Get session info to find the number of return tracks
-    session_info = send_command("get_session_info")
-    if session_info.get("status") != "success":
-        print("❌ Failed to get session info")
+    # Get the number of tracks and return tracks
+    track_count, return_track_count = get_track_counts()
+    if track_count is None:
         return False
     
-    return_track_count = session_info["result"]["return_track_count"]
     if return_track_count == 0:
         print("❌ No return tracks available for testing")
         return False
     
     # The return tracks are accessed using track indices after the regular tracks
-    track_count = session_info["result"]["track_count"]
-    
     # Use the last created return track instead of the first one
     # The index for return tracks is track_count + return_track_index
     return_track_index = return_track_count - 1  # Use the last return track
@@ -193,16 +157,18 @@ def main():
     """Run all tests."""
     print_divider("ABLETON MCP RETURN TRACK TEST")
     
-    # Check if server is running
+    # Check if server is running; connecting is enough, and the tests reuse the connection
     print("\nChecking connection to MCP server...")
-    session_info = send_command("get_session_info")
-    if session_info.get("status") != "success":
+    try:
+        connect()
+    except OSError:
         print("❌ Error: Failed to connect to MCP server")
         return 1
     
     print("✅ Successfully connected to MCP server")
     
-    # Run tests
+    # Run tests in order on the shared connection: the other tests use the
+    # return track the first one creates, and both of them change that track
     tests = [
         ("create_return_track", test_create_return_track),
         ("load_effect_on_return_track", test_load_effect_on_return_track),
@@ -4,14 +4,9 @@ Send Control Testing Script for Ableton MCP.
 This script tests the functionality of controlling send levels from tracks to return tracks.
 """
 
-import socket
-import json
-import time
 import sys
 
-# Connection settings
-HOST = "localhost"
-PORT = 9877
+from mcp_client import connect, send_command
 
 def print_divider(title=""):
     """Print a divider with an optional title."""
@@ -20,56 +15,6 @@ def print_divider(title=""):
         print(f"{title.center(80)}")
     print("=" * 80)
 
-def send_command(command_type, params=None):
-    """Send a command to the MCP server and return the result."""
-    if params is None:
-        params = {}
-    
-    print(f"Sending command: {command_type}")
-    print(f"Parameters: {json.dumps(params, indent=2)}")
-    
-    try:
-        # Create a socket connection
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            # Connect to the server
-            sock.connect((HOST, PORT))
-            
-            # Prepare the command
-            command = {
-                "type": command_type,
-                "params": params
-            }
-            
-            # Send the command
-            sock.sendall(json.dumps(command).encode('utf-8'))
-            
-            # Receive the response
-            response = b""
-            while True:
-                chunk = sock.recv(4096)
-                if not chunk:
-                    break
-                response += chunk
-                
-                # Check if we've received a complete JSON response
-                try:
-                    json.loads(response.decode('utf-8'))
-                    break  # If we can parse it, we have a complete response
-                except json.JSONDecodeError:
-                    continue  # Keep receiving if the JSON is incomplete
-            
-            # Parse and return the response
-            try:
-                result = json.loads(response.decode('utf-8'))
-                print(f"Response: {json.dumps(result, indent=2)}")
-                return result
-            except json.JSONDecodeError:
-                print(f"Error decoding JSON response: {response.decode('utf-8')}")
-                return {"status": "error", "message": "Failed to decode response"}
-    except Exception as e:
-        print(f"Error sending command: {str(e)}")
-        return {"status": "error", "message": str(e)}
-
 def test_create_tracks_and_return_tracks():
     """Test creating tracks and return tracks for testing send controls."""
     print_divider("CREATING TEST TRACKS AND RETURN TRACKS")
@@ -193,10 +138,11 @@ def main():
     """Run all tests."""
     print_divider("ABLETON MCP SEND CONTROL TEST")
     
-    # Check connection to MCP server
+    # Check connection to MCP server; connecting is enough, and the tests reuse the connection
     print("Checking connection to MCP server...")
-    session_info = send_command("get_session_info")
-    if session_info.get("status") != "success":
+    try:
+        connect()
+    except OSError:
         print("❌ Failed to connect to MCP server")
         return 1
     
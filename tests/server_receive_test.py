@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Server Response Framing Test for Ableton MCP.
+This script tests that the MCP server reassembles responses whose non-ASCII
+names are split across recv chunks. It needs neither Ableton nor the Remote
+Script: the response is fed to the server over a local socket pair.
+"""
+
+import json
+import os
+import socket
+import sys
+import threading
+
+# Import the MCP server from this checkout when the package isn't installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from MCP_Server.server import AbletonConnection
+
+def print_divider(title=""):
+    """Print a divider with an optional title."""
+    print("\n" + "=" * 80)
+    if title:
+        print(f"{title.center(80)}")
+    print("=" * 80)
+
+# A response encoded the way the Remote Script sends it: raw UTF-8, no escapes
+NON_ASCII_RESPONSE = {
+    "status": "success",
+    "result": {
+        "name": "Bässe – Tiefton 低音 🎛",
+        "devices": [{"name": "Réverbération"}, {"name": "Écho"}]
+    }
+}
+NON_ASCII_PAYLOAD = json.dumps(NON_ASCII_RESPONSE, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+def receive_split(payload, buffer_size):
+    """Send payload over a socket pair and receive it buffer_size bytes at a time."""
+    server_side, client_side = socket.socketpair()
+    try:
+        sender = threading.Thread(target=server_side.sendall, args=(payload,))
+        sender.start()
+        data = AbletonConnection(host="localhost", port=0).receive_full_response(client_side, buffer_size=buffer_size)
+        sender.join()
+        return data
+    finally:
+        server_side.close()
+        client_side.close()
+
+def test_non_ascii_split_across_chunks():
+    """Test receiving a non-ASCII response with every possible chunk split."""
+    print_divider("TESTING NON-ASCII RESPONSE SPLIT ACROSS CHUNKS")
+    
+    # Chunk sizes that end the first chunk inside each multibyte character
+    split_sizes = [i for i in range(1, len(NON_ASCII_PAYLOAD))
+                   if NON_ASCII_PAYLOAD[i] & 0xC0 == 0x80]
+    print(f"Payload is {len(NON_ASCII_PAYLOAD)} bytes, {len(split_sizes)} chunk sizes split a character")
+    
+    all_passed = True
+    for buffer_size in split_sizes:
+        try:
+            data = receive_split(NON_ASCII_PAYLOAD, buffer_size)
+        except Exception as e:
+            print(f"❌ Failed with {buffer_size}-byte chunks: {str(e)}")
+            all_passed = False
+            continue
+        
+        if json.loads(data) != NON_ASCII_RESPONSE:
+            print(f"❌ Response received in {buffer_size}-byte chunks doesn't match what was sent")
+            all_passed = False
+    
+    if all_passed:
+        print(f"✅ Received the response intact with all {len(split_sizes)} chunk sizes")
+    return all_passed
+
+def main():
+    """Run all tests."""
+    print_divider("ABLETON MCP SERVER RESPONSE FRAMING TEST")
+    
+    result = test_non_ascii_split_across_chunks()
+    
+    # Print summary
+    print_divider("TEST SUMMARY")
+    print(f"non_ascii_split_across_chunks: {'✅ PASSED' if result else '❌ FAILED'}")
+    
+    if result:
+        print("\n✅ All tests passed successfully!")
+        return 0
+    else:
+        print("\n⚠️ Some tests failed. See details above.")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,68 +6,45 @@ This script demonstrates the volume control functionality of the Ableton MCP sys
 It creates a track, sets its volume to different values, and displays the volume in dB.
 """
 
-import socket
-import json
+import os
 import time
-import sys
 
-# Connection settings
-HOST = "localhost"
-PORT = 9877
+from mcp_client import HOST, PORT, VERBOSE, connect, send_command, send_commands_batch
 
-def send_command(sock, command_type, params=None):
-    """Send a command to the Ableton MCP server and return the response"""
-    if params is None:
-        params = {}
-    
-    command = {
-        "type": command_type,
-        "params": params
-    }
-    
-    # Send the command
-    sock.sendall(json.dumps(command).encode('utf-8'))
-    
-    # Receive the response
-    response_data = b""
-    while True:
-        chunk = sock.recv(4096)
-        if not chunk:
-            break
-        response_data += chunk
-        
-        # Check if we have a complete JSON response
-        try:
-            json.loads(response_data.decode('utf-8'))
-            break  # If we can parse it, we have the full response
-        except json.JSONDecodeError:
-            continue  # Keep receiving if the JSON is incomplete
-    
-    # Parse and return the response
-    response = json.loads(response_data.decode('utf-8'))
-    return response
+def _observe_delay():
+    """Read MCP_TEST_OBSERVE_DELAY, falling back to no pause if it isn't a number"""
+    value = os.environ.get("MCP_TEST_OBSERVE_DELAY") or "0"
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        print(f"Ignoring MCP_TEST_OBSERVE_DELAY={value!r}: not a number of seconds")
+        return 0.0
+
+# Seconds to pause after each volume change so it can be watched in Ableton.
+# Without a pause the levels are all sent in one batch
+OBSERVE_DELAY = _observe_delay()
 
 def main():
     """Main function to test volume control functionality"""
     try:
-        # Connect to the Ableton MCP server
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.connect((HOST, PORT))
+        # Connect to the Ableton MCP server; the commands below reuse the connection
+        connect()
         print(f"Connected to Ableton MCP server at {HOST}:{PORT}")
         
-        # Get session info
-        response = send_command(sock, "get_session_info")
-        if response["status"] != "success":
-            print(f"Error getting session info: {response.get('message', 'Unknown error')}")
-            return
-        
-        print("Session info:")
-        print(f"  Tempo: {response['result']['tempo']} BPM")
-        print(f"  Time signature: {response['result']['signature_numerator']}/{response['result']['signature_denominator']}")
-        print(f"  Track count: {response['result']['track_count']}")
+        # Get session info; it is only displayed, so only fetch it when verbose
+        if VERBOSE:
+            response = send_command("get_session_info")
+            if response["status"] != "success":
+                print(f"Error getting session info: {response.get('message', 'Unknown error')}")
+                return
+            
+            print("Session info:")
+            print(f"  Tempo: {response['result']['tempo']} BPM")
+            print(f"  Time signature: {response['result']['signature_numerator']}/{response['result']['signature_denominator']}")
+            print(f"  Track count: {response['result']['track_count']}")
         
         # Create a new MIDI track
-        response = send_command(sock, "create_midi_track")
+        response = send_command("create_midi_track")
         if response["status"] != "success":
             print(f"Error creating MIDI track: {response.get('message', 'Unknown error')}")
             return
@@ -78,7 +55,7 @@ def main():
         
         # Set the track name
         new_name = "Volume Test Track"
-        response = send_command(sock, "set_track_name", {
+        response = send_command("set_track_name", {
             "track_index": track_index,
             "name": new_name
         })
@@ -89,7 +66,7 @@ def main():
         print(f"Renamed track to: {new_name}")
         
         # Get the current track info to see the default volume
-        response = send_command(sock, "get_track_info", {
+        response = send_command("get_track_info", {
             "track_index": track_index
         })
         if response["status"] != "success":
@@ -110,12 +87,19 @@ def main():
             {"value": 1.0, "description": "Maximum (+6dB)"}
         ]
         
-        for level in volume_levels:
-            # Set the volume
-            response = send_command(sock, "set_track_volume", {
-                "track_index": track_index,
-                "value": level["value"]
-            })
+        # Everything but the value is the same for each command in the sweep
+        base_params = {"track_index": track_index}
+        
+        commands = [("set_track_volume", dict(base_params, value=level["value"]))
+                    for level in volume_levels]
+        if OBSERVE_DELAY:
+            # Send each level only after the previous one has been shown
+            responses = (send_command(*command) for command in commands)
+        else:
+            # Set every volume level in one batch; the server applies them in order
+            responses = send_commands_batch(commands)
+        
+        for level, response in zip(volume_levels, responses):
             if response["status"] != "success":
                 print(f"Error setting volume: {response.get('message', 'Unknown error')}")
                 continue
@@ -133,7 +117,8 @@ def main():
             print(f"  Set volume to {level['description']}: {volume:.3f} ({volume_db_str})")
             
             # Small delay to see the change in Ableton
-            time.sleep(1)
+            if OBSERVE_DELAY:
+                time.sleep(OBSERVE_DELAY)
         
         print("\nVolume control test completed successfully!")
         
@@ -142,9 +127,6 @@ def main():
         print("Make sure Ableton Live is running with the AbletonMCP Remote Script loaded.")
     except Exception as e:
         print(f"Error: {str(e)}")
-    finally:
-        if 'sock' in locals():
-            sock.close()
 
 if __name__ == "__main__":
     main()